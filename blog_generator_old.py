@@ -3,19 +3,638 @@ EVIKA Blog Generator for AEO and GEO content
 Generates structured blog posts with JSON-LD schema markup
 """
 
+import asyncio
+import functools
+import io
+from concurrent.futures import ProcessPoolExecutor
 import json
+import logging
+import os
 import re
-from typing import Dict, List, Any, Optional
+import string
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
 from datetime import datetime
 
+try:  # orjson is optional; fall back to the stdlib encoder
+    import orjson
+except ImportError:
+    orjson = None
+
+log = logging.getLogger(__name__)
+
+# Schema.org vocabulary shared by every JSON-LD block
+_SCHEMA_CTX = sys.intern("https://schema.org")
+_T_ARTICLE = sys.intern("Article")
+_T_ORG = sys.intern("Organization")
+_T_FAQPAGE = sys.intern("FAQPage")
+_T_QUESTION = sys.intern("Question")
+_T_ANSWER = sys.intern("Answer")
+_T_LB = sys.intern("LocalBusiness")
+_T_ADDR = sys.intern("PostalAddress")
+
+# Static JSON-LD skeletons; builders copy these and fill per-post fields
+_ARTICLE_BASE = {"@context": _SCHEMA_CTX, "@type": _T_ARTICLE}
+_ORG_BASE = {"@type": _T_ORG}
+_LOCAL_BUSINESS_BASE = {"@context": _SCHEMA_CTX, "@type": _T_LB}
+_ADDRESS_BASE = {"@type": _T_ADDR, "addressCountry": "LT"}  # Default to Lithuania
+
+# JSON-LD text, formatted with the post context
+_AEO_HEADLINE = "{kw}: Complete Guide"
+_AEO_DESCRIPTION = "Comprehensive guide to {kw} by {brand}"
+_GEO_HEADLINE = "{kw} in {city}: Local Guide"
+_GEO_DESCRIPTION = "Local guide to {kw} in {city} by {brand}"
+_LB_DESCRIPTION = "{brand} provides {kw} services"
+
+_MAX_META = 160
+
+# Input bounds; longer values are truncated before they are embedded in a post
+_MAX_KEYWORD = 80
+_MAX_BRAND = 80
+_MAX_CITY = 60
+
+# Below this many posts a process pool costs more to start than it saves
+_MIN_POOL_BATCH = 256
+
+
+class Section(NamedTuple):
+    heading: str
+    content: str
+
+
+class FAQ(NamedTuple):
+    question: str
+    answer: str
+
+
+class Image(NamedTuple):
+    alt: str
+    src: str
+    caption: str
+
+
+class Link(NamedTuple):
+    text: str
+    url: str
+    anchor: str
+
+
+class MetaTemplate(NamedTuple):
+    """A meta description template split into literal/field pieces"""
+    template: str
+    pieces: Tuple[Tuple[str, Optional[str]], ...]
+    fixed_len: int
+    fields: Tuple[str, ...]
+
+
+def _meta_template(template: str) -> MetaTemplate:
+    """Parse a {field} template once so its rendered length can be predicted"""
+    pieces = tuple((literal, field) for literal, field, _, _ in string.Formatter().parse(template))
+    return MetaTemplate(
+        template,
+        pieces,
+        sum(len(literal) for literal, _ in pieces),
+        tuple(field for _, field in pieces if field is not None),
+    )
+
+
+class LangPack(NamedTuple):
+    """All templates for one language"""
+    aeo_meta: MetaTemplate
+    geo_meta: MetaTemplate
+    aeo_intro: str
+    aeo_city_intro: str
+    geo_title_md: str
+    geo_intro: str
+    geo_conclusion: str
+    aeo_sections: Tuple[Tuple[str, str], ...]
+    geo_sections: Tuple[Tuple[str, str], ...]
+    aeo_faqs: Tuple[Tuple[str, str], ...]
+    geo_faqs: Tuple[Tuple[str, str], ...]
+    images: Tuple[Tuple[str, str, str], ...]
+    internal_links: Tuple[Tuple[str, str, str], ...]
+    expansion: str
+    localized: Dict[str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class PostParams:
+    """Per-post values shared by every builder"""
+    kw: str
+    brand: str
+    language: str
+    site_city: Optional[str]
+    now_iso: str
+    city: str
+    landmarks: str
+    lang: str
+    pack: LangPack
+    ctx: Dict[str, Any]
+
+# Section/FAQ templates, formatted with kw, brand, city and landmarks
+_AEO_SECTIONS_LT = (
+    (
+        "Kas yra {kw}?",
+        "Suprasti {kw} yra labai svarbu priimant pagrįstus sprendimus. {brand} teikia išsamius patarimus šia tema. Šis vadovas apima viską, ką reikia žinoti apie geriausių variantų paiešką, kainų palyginimą ir protingus sprendimus.",
+    ),
+    (
+        "{kw} pagrindiniai privalumai",
+        "Atraskite {kw} privalumus ir kaip jie gali jums padėti. Mūsų {brand} ekspertai nustatė svarbiausius privalumus, įskaitant kokybę, patogumą ir vertę. Išsamiai aptarsime kiekvieną privalumą su tikrais pavyzdžiais ir palyginimais.",
+    ),
+    (
+        "Palyginimas: {kw} vs alternatyvos",
+        "Palyginkite {kw} su kitais variantais, kad priimtumėte geriausią sprendimą. {brand} siūlo išsamius palyginimus, kurie padės jums apsispręsti. Apsvarstysime kainų skirtumus, kokybės variacijas ir prieinamumą skirtinguose variantuose.",
+    ),
+    (
+        "Kaip pasirinkti tinkamą {kw}",
+        "Išmokite kriterijus, kaip pasirinkti geriausią {kw} jūsų poreikiams. {brand} teikia ekspertų vadovavimą, atsižvelgdama į biudžetą, kokybę ir asmeninius pageidavimus. Pateiksime žingsnis po žingsnio vadovą, kuris padės priimti teisingą sprendimą.",
+    ),
+    (
+        "Patarimai ir rekomendacijos",
+        "Gaukite ekspertų patarimų ir rekomendacijų apie {kw}. {brand} dalijasi vidinėmis žiniomis apie tai, ko ieškoti, kokių klaidų vengti ir kaip gauti geriausią vertę už savo pinigus.",
+    ),
+    (
+        "Išvados: {kw} vadovas",
+        "Priimkite pagrįstus sprendimus apie {kw} su mūsų išsamiais vadovais. {brand} yra jūsų patikimas šaltinis ekspertų patarimams ir profesionaliam vadovavimui.",
+    ),
+)
+
+_AEO_SECTIONS_EN = (
+    (
+        "What is {kw}?",
+        "Understanding {kw} is essential for making informed decisions. {brand} provides comprehensive insights into this topic. This guide covers everything you need to know about finding the best options, comparing prices, and making smart choices.",
+    ),
+    (
+        "Key Benefits of {kw}",
+        "Discover the advantages of {kw} and how it can benefit you. Our experts at {brand} have identified the most important benefits including quality, convenience, and value. We'll explore each benefit in detail with real examples and comparisons.",
+    ),
+    (
+        "Comparison: {kw} vs Alternatives",
+        "Compare {kw} with other options to make the best choice. {brand} offers detailed comparisons to help you decide. We'll look at price differences, quality variations, and availability across different options.",
+    ),
+    (
+        "How to Choose the Right {kw}",
+        "Learn the criteria for selecting the best {kw} for your needs. {brand} provides expert guidance on factors like budget, quality, and personal preferences. We'll provide a step-by-step guide to help you make the right decision.",
+    ),
+    (
+        "Tips and Recommendations",
+        "Get expert tips and recommendations for {kw}. {brand} shares insider knowledge about what to look for, common mistakes to avoid, and how to get the best value for your money.",
+    ),
+    (
+        "Conclusion: {kw} Guide",
+        "Make informed decisions about {kw} with our comprehensive guide. {brand} is your trusted source for expert insights and professional recommendations.",
+    ),
+)
+
+_GEO_SECTIONS_LT = (
+    (
+        "{kw} {city}: Vietinis apžvalga",
+        "Atraskite geriausias {kw} galimybes {city}. {brand} teikia vietinius patarimus ir rekomendacijas {city} gyventojams. Nuo {landmarks}, mes jums padėsime per geriausias vietas ir kas daro kiekvieną sritį unikalią apsipirkimui.",
+    ),
+    (
+        "Geriausios {kw} vietos {city}",
+        "Raskite populiariausias {kw} vietas {city}, įskaitant sritis šalia {landmarks}. {brand} geriau žino {city} ir gali rekomenduoti geriausias vietas pagal jūsų pageidavimus. Apžvelgsime prekybos centrus, vietines parduotuves ir paslėptas perlas.",
+    ),
+    (
+        "Interneto vs vietinis {kw} {city}",
+        "Palyginkite internetinius ir vietinius {kw} patirtis {city}. {brand} padeda pasirinkti geriausią variantą jūsų poreikiams. Aptarsime vietinio apsipirkimo {city} privalumus lyginant su internetiniais variantais, įskaitant nedelsiant prieinamumą, asmeninį aptarnavimą ir vietinę ekspertizę.",
+    ),
+    (
+        "Vietinio {kw} privalumai {city}",
+        "Išmokite, kodėl vietinis {kw} {city} siūlo unikalius privalumus. {brand} jungia jus su geriausiais vietiniais variantais ir paaiškina vietinių verslų {city} palaikymo privalumus. Apžvelgsime patogumą, vietines žinias ir bendruomenės palaikymą.",
+    ),
+    (
+        "Geriausi apsipirkimo laikai {city}",
+        "Atraskite optimalius laikus apsilankyti {kw} vietose {city}. {brand} dalijasi vidiniais patarimais apie tai, kada parduotuvės mažiau apkrautos, kada paprastai vyksta nuolaidos ir kaip suplanuoti apsipirkimo kelionę geriausiai.",
+    ),
+    (
+        "Išvados: {kw} {city}",
+        "Išnaudokite {kw} {city} su mūsų vietiniu vadovu. {brand} yra jūsų patikimas partneris {city} ir esame įsipareigoję padėti rasti tiksliai tai, ko ieškote.",
+    ),
+)
+
+_GEO_SECTIONS_EN = (
+    (
+        "{kw} in {city}: Local Overview",
+        "Discover the best {kw} options in {city}. {brand} provides local insights and recommendations for {city} residents. From {landmarks}, we'll guide you through the top locations and what makes each area unique for shopping.",
+    ),
+    (
+        "Top {kw} Locations in {city}",
+        "Find the most popular {kw} spots in {city}, including areas near {landmarks}. {brand} knows {city} best and can recommend the best places based on your preferences. We'll cover shopping centers, local boutiques, and hidden gems.",
+    ),
+    (
+        "Online vs Local {kw} in {city}",
+        "Compare online and local {kw} experiences in {city}. {brand} helps you choose the best option for your needs. We'll discuss the advantages of shopping locally in {city} versus online options, including immediate availability, personal service, and local expertise.",
+    ),
+    (
+        "Local {kw} Benefits in {city}",
+        "Learn why local {kw} in {city} offers unique advantages. {brand} connects you with the best local options and explains the benefits of supporting local businesses in {city}. We'll cover convenience, local knowledge, and community support.",
+    ),
+    (
+        "Best Times to Shop in {city}",
+        "Discover the optimal times to visit {kw} locations in {city}. {brand} shares insider tips about when stores are less crowded, when sales typically occur, and how to plan your shopping trip for the best experience.",
+    ),
+    (
+        "Conclusion: {kw} in {city}",
+        "Make the most of {kw} in {city} with our local guide. {brand} is your trusted partner in {city} and we're committed to helping you find exactly what you're looking for.",
+    ),
+)
+
+_AEO_FAQS_LT = (
+    (
+        "Kur pigiausia pirkti kvepalus Vilniuje?",
+        "Geriausios kainos kvepalams Vilniuje randamos {brand} parduotuvėse. Mes siūlome konkurencingas kainas su skaidriais įkainiais. Turime variantų kiekvienam biudžetui - nuo prieinamų iki premium pasirinkimų.",
+    ),
+    (
+        "Ar galima nusipirkti kvepalų testerius?",
+        "Taip! {brand} siūlo kvepalų testerių galimybes, kad galėtumėte išbandyti prieš pirkdami. Suprantame, kaip svarbu rasti tinkamą variantą, ir mūsų ekspertai padės jums per visą procesą.",
+    ),
+    (
+        "Kur gauti nišinius kvepalus Vilniuje?",
+        "{brand} specializuojasi tiek populiarių, tiek nišinių kvepalų srityje. Turime prieigą prie ekskluzyvių kolekcijų ir galime padėti rasti unikalius kvepalus, kurių nėra kitur. Mūsų ekspertai puikiai žino rinką.",
+    ),
+    (
+        "Ar visi kvepalai autentiški?",
+        "Taip, {brand} garantuoja visų mūsų produktų autentiškumą. Dirbame tiesiogiai su patikrintais tiekėjais ir teikiame autentiškumo sertifikatus. Mūsų reputacija remiasi pasitikėjimu ir kokybės užtikrinimu.",
+    ),
+    (
+        "Kur geriausia kvepalų pasirinkimas Vilniuje?",
+        "Geriausias kvepalų pasirinkimas Vilniuje yra {brand} parduotuvėse. Siūlome platų asortimentą, tinkantį skirtingiems biudžetams ir skoniams, su ekspertų vadovavimu, kuris padės jums pasirinkti.",
+    ),
+    (
+        "Kada geriausia laikas pirkti kvepalus?",
+        "Geriausias laikas pirkti kvepalus yra per {brand} akcijas ir specialius pasiūlymus. Reguliariai organizuojame nuolaidas ir sezoninius pasiūlymus, kurie puikiai tinka Vilniaus pirkėjams.",
+    ),
+)
+
+_AEO_FAQS_EN = (
+    (
+        "What are the best options for {kw}?",
+        "When looking for the best options, {brand} recommends considering quality, price, and availability. We offer a wide range of options to suit different budgets and preferences, with expert guidance to help you choose.",
+    ),
+    (
+        "How much should I expect to pay?",
+        "Prices vary depending on quality and brand. {brand} offers competitive pricing with transparent quotes. We have options for every budget, from affordable choices to premium selections, ensuring you get the best value.",
+    ),
+    (
+        "Are there any authentic options available?",
+        "Yes, {brand} guarantees authenticity for all our products. We work directly with verified suppliers and provide certificates of authenticity. Our reputation is built on trust and quality assurance.",
+    ),
+    (
+        "Can I test before buying?",
+        "Absolutely! {brand} offers testing opportunities so you can try before you buy. We understand the importance of finding the right fit, and our experts are available to guide you through the testing process.",
+    ),
+    (
+        "What about niche or specialty options?",
+        "{brand} specializes in both popular and niche options. We have access to exclusive collections and can help you find unique items that aren't available elsewhere. Our experts know the market inside and out.",
+    ),
+    (
+        "Where can I find the cheapest options?",
+        "For budget-conscious shoppers, {brand} offers several affordable options without compromising quality. We regularly have sales and special offers, and our team can help you find the best deals available.",
+    ),
+)
+
+_GEO_FAQS_LT = (
+    (
+        "Kur galiu rasti geriausius variantus {city}?",
+        "{brand} turi kelias vietas visoje {city}, įskaitant sritis šalia {landmarks}. Galime rekomenduoti geriausias vietas pagal jūsų pageidavimus ir suteikti išsamias instrukcijas į mūsų parduotuves.",
+    ),
+    (
+        "Kokie privalumai apsipirkti vietiniame vs internete?",
+        "Apsipirkimas vietiniame {city} su {brand} siūlo nedelsiant prieinamumą, asmeninį aptarnavimą ir vietinę ekspertizę. Galite pamatyti, paliesti ir išbandyti produktus prieš pirkdami, plius gauti momentinius ekspertų patarimus iš mūsų {city} komandos.",
+    ),
+    (
+        "Ar yra specialių pasiūlymų {city} gyventojams?",
+        "Taip, {brand} siūlo ekskluzyvius pasiūlymus {city} gyventojams, įskaitant vietines nuolaidas ir specialius pasiūlymus. Taip pat turime lojalumo programas ir sezoninius pasiūlymus, kurie puikiai tinka {city} pirkėjams.",
+    ),
+    (
+        "Ar galiu gauti tą pačią dieną paslaugą {city}?",
+        "Žinoma! {brand} teikia tą pačią dieną paslaugas visoje {city}. Mūsų vietinė komanda užtikrina greitą apdorojimą ir dažnai gali prisitaikyti prie skubų {city} klientų prašymų.",
+    ),
+    (
+        "Kuo {brand} skiriasi nuo kitų variantų {city}?",
+        "{brand} išsiskiria {city} su savo vietine ekspertize, individualizuotu aptarnavimu ir giliu {city} unikalių poreikių supratimu. Mes ne tik dar viena grandinė - mes esame {city} bendruomenės dalis.",
+    ),
+    (
+        "Ar teikiate pristatymą visoje {city}?",
+        "Taip, {brand} teikia išsamias pristatymo paslaugas visoje {city}, įskaitant sritis šalia {landmarks}. Užtikriname greitą, patikimą pristatymą su sekimu ir klientų palaikymu iš mūsų {city} komandos.",
+    ),
+)
+
+_GEO_FAQS_EN = (
+    (
+        "Where can I find the best options in {city}?",
+        "{brand} has multiple locations throughout {city}, including areas near {landmarks}. We can recommend the best spots based on your preferences and provide detailed directions to our stores.",
+    ),
+    (
+        "What are the advantages of shopping locally vs online?",
+        "Shopping locally in {city} with {brand} offers immediate availability, personal service, and local expertise. You can see, touch, and test products before buying, plus get instant expert advice from our {city} team.",
+    ),
+    (
+        "Are there any special offers for {city} residents?",
+        "Yes, {brand} offers exclusive deals for {city} residents, including local discounts and special promotions. We also have loyalty programs and seasonal offers that are perfect for {city} shoppers.",
+    ),
+    (
+        "Can I get same-day service in {city}?",
+        "Absolutely! {brand} provides same-day service throughout {city}. Our local team ensures fast turnaround times and can often accommodate urgent requests from {city} customers.",
+    ),
+    (
+        "What makes {brand} different from other options in {city}?",
+        "{brand} stands out in {city} with our local expertise, personalized service, and deep understanding of {city}'s unique needs. We're not just another chain - we're part of the {city} community.",
+    ),
+    (
+        "Do you offer delivery throughout {city}?",
+        "Yes, {brand} offers comprehensive delivery services throughout {city}, including to areas near {landmarks}. We ensure fast, reliable delivery with tracking and customer support from our {city} team.",
+    ),
+)
+
+# (alt, src, caption) image templates; src uses the slugged keyword/brand
+_IMAGES_LT = (
+    ("{kw} vadovas Vilniuje", "/images/{kw_slug}-overview.jpg", "Išsamus {kw} vadovas"),
+    ("{brand} kvepalų parduotuvė Vilniuje", "/images/{brand_slug}-services.jpg", "{brand} profesionalūs kvepalų paslaugos Vilniuje"),
+)
+
+_IMAGES_EN = (
+    ("{kw} overview image", "/images/{kw_slug}-overview.jpg", "Comprehensive guide to {kw}"),
+    ("{brand} {kw} services", "/images/{brand_slug}-services.jpg", "{brand} professional {kw} services"),
+)
+
+# (text, url, anchor) link templates; only the text depends on the brand
+_INTERNAL_LINKS_LT = (
+    ("Sužinokite daugiau apie {brand} paslaugas", "/services", "mūsų-paslaugos"),
+    ("Susisiekite su {brand} konsultacijai", "/contact", "susisiekite-su-mumis"),
+)
+
+_INTERNAL_LINKS_EN = (
+    ("Learn more about {brand} services", "/services", "our-services"),
+    ("Contact {brand} for consultation", "/contact", "get-in-touch"),
+)
+
+
+# Word-count padding appended by _ensure_word_count; formatted with the brand.
+# The leading indentation is part of the emitted Markdown.
+_EXPANSION_LT = """
+                
+                ## Papildomi įžvalgos ir patarimai
+
+                Apsvarstydami savo variantus, svarbu įvertinti kelis pagrindinius veiksnius:
+
+                **Kokybės vertinimas**: Ieškokite kokybės rodiklių, tokių kaip medžiagos, meistriškumas ir prekės ženklo reputacija. {brand} palaiko aukštus standartus visuose mūsų pasiūlymuose.
+
+                **Vertės palyginimas**: Palyginkite ne tik kainą, bet ir vertę - ką gaunate už savo investiciją. Apsvarstykite ilgalaikius privalumus, patvarumą ir bendrą pasitenkinimą.
+
+                **Ekspertų rekomendacijos**: Mūsų {brand} komanda turi didelę patirtį ir gali suteikti individualizuotas rekomendacijas, atsižvelgdama į jūsų specifinius poreikius ir pageidavimus.
+
+                **Klientų atsiliepimai**: Skaitykite autentiškus atsiliepimus iš kitų klientų, kurie priėmė panašius sprendimus. Jų patirtis gali suteikti vertingų įžvalgų.
+
+                **Išbandymas ir testavimas**: Kada tik įmanoma, išbandykite ar paragaukite prieš priimdami galutinį sprendimą. {brand} siūlo įvairius būdus išbandyti mūsų produktus prieš pirkimą.
+
+                **Po pardavimo palaikymas**: Apsvarstykite palaikymą ir paslaugas, kurias gausite po pirkimo. {brand} teikia išsamų klientų aptarnavimą ir palaikymą.
+
+                **Ilgalaikiai svarstymai**: Pagalvokite, kaip jūsų pasirinkimas tarnaus jums laikui bėgant, ne tik iš karto. Kokybė ir patvarumas dažnai suteikia geresnę ilgalaikę vertę.
+
+                **Asmeniniai pageidavimai**: Jūsų individualūs poreikiai, stilius ir pageidavimai turėtų vadovauti jūsų sprendimui. {brand} siūlo įvairius variantus, tinkančius skirtingiems skoniams ir reikalavimams.
+
+                **Biudžeto planavimas**: Nustatykite realų biudžetą ir laikykitės jo, bet taip pat apsvarstykite kokybės investavimo vertę. Kartais šiek tiek daugiau išleisti iš karto ilgainiui sutaupo pinigų.
+
+                **Tyrimai ir švietimas**: Skirkite laiko išmokti apie savo variantus. {brand} teikia švietimo išteklius ir ekspertų vadovavimą, kuris padės priimti pagrįstus sprendimus.
+                """
+
+_EXPANSION_EN = """
+                
+                ## Additional Insights and Tips
+
+                When considering your options, it's important to evaluate several key factors:
+
+                **Quality Assessment**: Look for indicators of quality such as materials, craftsmanship, and brand reputation. {brand} maintains high standards across all our offerings.
+
+                **Value Comparison**: Compare not just price, but value - what you get for your investment. Consider long-term benefits, durability, and overall satisfaction.
+
+                **Expert Recommendations**: Our team at {brand} has extensive experience and can provide personalized recommendations based on your specific needs and preferences.
+
+                **Customer Reviews**: Read authentic reviews from other customers who have made similar choices. Their experiences can provide valuable insights.
+
+                **Trial and Testing**: Whenever possible, test or sample before making a final decision. {brand} offers various ways to experience our products before purchase.
+
+                **After-Sales Support**: Consider the support and service you'll receive after your purchase. {brand} provides comprehensive customer service and support.
+
+                **Long-term Considerations**: Think about how your choice will serve you over time, not just immediately. Quality and durability often provide better long-term value.
+
+                **Personal Preferences**: Your individual needs, style, and preferences should guide your decision. {brand} offers diverse options to suit different tastes and requirements.
+
+                **Budget Planning**: Set a realistic budget and stick to it, but also consider the value of investing in quality. Sometimes spending a bit more upfront saves money long-term.
+
+                **Research and Education**: Take time to learn about your options. {brand} provides educational resources and expert guidance to help you make informed decisions.
+                """
+
+
+_LOCALIZED_LT = {
+    'faq_heading': 'Dažniausiai užduodami klausimai',
+    'conclusion': 'Išvados',
+    'intro_prefix': 'Vilniaus pirkėjai dažnai klausia, kur geriausia įsigyti originalius kvepalus',
+    'benefits_heading': 'Pagrindiniai privalumai',
+    'comparison_heading': 'Palyginimas',
+    'tips_heading': 'Patarimai ir rekomendacijos',
+    'quality_heading': 'Kokybės vertinimas',
+    'value_heading': 'Vertės palyginimas',
+    'expert_heading': 'Ekspertų rekomendacijos'
+}
+
+_LOCALIZED_EN = {
+    'faq_heading': 'Frequently Asked Questions',
+    'conclusion': 'Conclusion',
+    'intro_prefix': 'Local buyers often ask where to find authentic products',
+    'benefits_heading': 'Key Benefits',
+    'comparison_heading': 'Comparison',
+    'tips_heading': 'Tips and Recommendations',
+    'quality_heading': 'Quality Assessment',
+    'value_heading': 'Value Comparison',
+    'expert_heading': 'Expert Recommendations'
+}
+
+# Post titles and article Markdown shared by both languages (the AEO conclusion is Lithuanian in both)
+_AEO_TITLE = "{kw}: Complete Guide | {brand}"
+_GEO_TITLE = "{kw} in {city}: Local Guide | {brand}"
+_AEO_TITLE_MD = "# {kw}: Complete Guide\n\n"
+_AEO_CONCLUSION_MD = (
+    "Suprasti {kw} yra labai svarbu priimant pagrįstus sprendimus. {brand} yra jūsų patikimas partneris, "
+    "teikiantis ekspertų patarimus ir profesionalias paslaugas.\n\n"
+)
+
+# Everything that varies by language, keyed by the language code prefix
+_LANG_REGISTRY: Dict[str, LangPack] = {
+    "lt": LangPack(
+        aeo_meta=_meta_template(
+            "{brand} - Išsamus {kw} vadovas. Ekspertų patarimai, palyginimai ir patarimai. Pradėkite dabar!"
+        ),
+        geo_meta=_meta_template(
+            "{brand} - Geriausi {kw} {city}. Ekspertų vietinis vadovavimas ir patarimai. Apsilankykite šiandien!"
+        ),
+        aeo_intro=(
+            _LOCALIZED_LT["intro_prefix"] + ". {brand} teikia ekspertų patarimus, kurie padės rasti geriausias "
+            "kvepalų pirkimo galimybes Vilniuje."
+        ),
+        aeo_city_intro=" Šiame vadove aptarsime geriausias {kw} galimybes {site_city} ir apylinkėse.\n\n",
+        geo_title_md="# {kw} {city}: Vietinis vadovas\n\n",
+        geo_intro="Atraskite geriausias {kw} galimybes {city}. {brand} teikia vietinę ekspertizę ir įžvalgas {city} gyventojams.\n\n",
+        geo_conclusion="Išnaudokite {kw} {city} su mūsų vietiniu vadovu. {brand} yra jūsų patikimas partneris {city}.\n\n",
+        aeo_sections=_AEO_SECTIONS_LT,
+        geo_sections=_GEO_SECTIONS_LT,
+        aeo_faqs=_AEO_FAQS_LT,
+        geo_faqs=_GEO_FAQS_LT,
+        images=_IMAGES_LT,
+        internal_links=_INTERNAL_LINKS_LT,
+        expansion=_EXPANSION_LT,
+        localized=_LOCALIZED_LT,
+    ),
+    "en": LangPack(
+        aeo_meta=_meta_template("{brand} - Complete {kw} guide. Expert insights, comparisons & tips. Start now!"),
+        geo_meta=_meta_template("{brand} - Best {kw} in {city}. Expert local guidance & insights. Visit us today!"),
+        aeo_intro=_LOCALIZED_EN["intro_prefix"] + ". {brand} provides expert guidance to help you find the best options.",
+        aeo_city_intro=" This guide covers the best {kw} options in {site_city} and surrounding areas.\n\n",
+        geo_title_md="# {kw} in {city}: Local Guide\n\n",
+        geo_intro="Discover the best {kw} options in {city}. {brand} provides local expertise and insights for {city} residents.\n\n",
+        geo_conclusion="Make the most of {kw} in {city} with our local guide. {brand} is your trusted partner in {city}.\n\n",
+        aeo_sections=_AEO_SECTIONS_EN,
+        geo_sections=_GEO_SECTIONS_EN,
+        aeo_faqs=_AEO_FAQS_EN,
+        geo_faqs=_GEO_FAQS_EN,
+        images=_IMAGES_EN,
+        internal_links=_INTERNAL_LINKS_EN,
+        expansion=_EXPANSION_EN,
+        localized=_LOCALIZED_EN,
+    ),
+}
+
+
+def _now_iso() -> str:
+    """Current time as an ISO string; seconds precision is enough for posts"""
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _dumps(obj: Any) -> str:
+    """Compact JSON encoding via orjson, or json when it is not installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _bounded(value: str, limit: int, name: str) -> str:
+    """Truncate an input string to limit chars, warning when it was too long"""
+    if len(value) <= limit:
+        return value
+    log.warning("%s longer than %d chars, truncating", name, limit)
+    return value[:limit]
+
+
+def _format_meta(meta: MetaTemplate, ctx: Dict[str, Any]) -> str:
+    """Render a meta description of at most _MAX_META chars without over-building it"""
+    length = meta.fixed_len
+    for field in meta.fields:
+        length += len(ctx[field])
+    if length <= _MAX_META:
+        # Common case: everything fits, one C-level format call
+        return meta.template.format_map(ctx)
+    
+    # Long brand/keyword: stop assembling once the budget is used up
+    parts = []
+    budget = _MAX_META
+    for literal, field in meta.pieces:
+        for part in (literal, ctx[field] if field is not None else ""):
+            if len(part) >= budget:
+                parts.append(part[:budget])
+                return "".join(parts)
+            parts.append(part)
+            budget -= len(part)
+    return "".join(parts)
+
+
+# Lowercases ASCII letters and hyphenates spaces in one translate() pass
+_SLUG_TABLE = str.maketrans({**{c: c.lower() for c in string.ascii_uppercase}, " ": "-"})
+
+
+@functools.lru_cache(maxsize=1024)
+def _slug(text: str) -> str:
+    """Lowercase text and hyphenate spaces for image paths"""
+    if text.isascii():
+        return text.translate(_SLUG_TABLE)
+    # Non-ASCII capitals (Š, Ž, ...) need full Unicode lowercasing
+    return text.lower().replace(" ", "-")
+
+
+@functools.lru_cache(maxsize=256)
+def _render_images(kw: str, brand: str, lang: str) -> Tuple[Image, ...]:
+    """Format the image templates once per (keyword, brand, language)"""
+    ctx = {"kw": kw, "brand": brand, "kw_slug": _slug(kw), "brand_slug": _slug(brand)}
+    templates = _LANG_REGISTRY[lang].images
+    return tuple(Image(*(part.format_map(ctx) for part in image)) for image in templates)
+
+
+@functools.lru_cache(maxsize=1024)
+def _render_items(item_type: type, templates: Tuple[Tuple[str, str], ...], kw: str, brand: str,
+                  city: str, landmarks: str) -> Tuple[Any, ...]:
+    """Format section/FAQ templates once per (templates, keyword, brand, city)"""
+    ctx = {"kw": kw, "brand": brand, "city": city, "landmarks": landmarks}
+    return tuple(item_type(first.format_map(ctx), second.format_map(ctx)) for first, second in templates)
+
+
+@functools.lru_cache(maxsize=256)
+def _render_links(brand: str, lang: str) -> Tuple[Link, ...]:
+    """Format the internal link texts once per (brand, language)"""
+    templates = _LANG_REGISTRY[lang].internal_links
+    ctx = {"brand": brand}
+    return tuple(Link(text.format_map(ctx), url, anchor) for text, url, anchor in templates)
+
+
+@functools.lru_cache(maxsize=256)
+def _render_expansion(brand: str, lang: str) -> Tuple[str, int]:
+    """Format the word-count expansion once per (brand, language), with its word count"""
+    expansion = _LANG_REGISTRY[lang].expansion.format_map({"brand": brand})
+    return expansion, len(expansion.split())
+
+
+# City spellings in priority order; group n maps to _CITY_BY_GROUP[n]
+_CITY_RE = re.compile(
+    r"(kaune|kaunas)|(vilniuje|vilnius)|(klaipėdoje|klaipeda)|(šiauliuose|siauliai)|(panevėžyje|panevezys)"
+)
+_CITY_BY_GROUP = (None, "Kaunas", "Vilnius", "Klaipėda", "Šiauliai", "Panevėžys")
+
+
+@functools.lru_cache(maxsize=1024)
+def _detect_city(target_keyword: str) -> str:
+    """Detect a Lithuanian city mentioned in the target keyword"""
+    # Lowest group number wins so Kaunas > Vilnius > ... as before
+    group = min((m.lastindex for m in _CITY_RE.finditer(target_keyword.lower())), default=None)
+    if group is None:
+        return "Vilnius"  # Default fallback
+    return _CITY_BY_GROUP[group]
+
+
+# Local landmarks used in GEO copy, by city
+_LANDMARKS = {
+    "Kaunas": "Akropolis, Mega, Laisvės alėja",
+    "Vilnius": "Akropolis, Panorama, Gedimino pr.",
+    "Klaipėda": "Akropolis, Švyturys, Tiltų g.",
+    "Šiauliai": "Saulės miestas, Tilžės g., Vilniaus g.",
+    "Panevėžys": "Akropolis, Respublikos g., Smėlynės g.",
+}
+_DEFAULT_LANDMARKS = "Akropolis, Panorama, Gedimino pr."
+
+
 class BlogGenerator:
+    """Template-based AEO/GEO blog generator.
+    
+    Holds no per-post state: every helper receives the keyword, brand,
+    language and timestamp it needs, so one instance can be shared across
+    threads or pickled into worker processes.
+    """
+    
     def __init__(self):
-        self.language = "en"
-        self.brand_name = ""
-        self.target_keyword = ""
-        self.mode = "AEO"  # AEO or GEO
-        self.context = None
-        self.site_city = None
+        self._dispatch = {
+            "AEO": self._generate_aeo_content,
+            "GEO": self._generate_geo_content,
+        }
         
     def generate_blog_post(self, 
                           brand_name: str, 
@@ -23,696 +642,389 @@ class BlogGenerator:
                           language: str = "en",
                           mode: str = "AEO",
                           context: Dict[str, Any] = None,
-                          site_city: str = None) -> Dict[str, Any]:
+                          site_city: str = None,
+                          generated_at: Optional[str] = None) -> Dict[str, Any]:
         """
         Generate a blog post based on the provided parameters
         
         Args:
-            brand_name: Name of the brand
-            target_keyword: Target keyword for SEO
+            brand_name: Name of the brand (truncated to 80 chars)
+            target_keyword: Target keyword for SEO (truncated to 80 chars)
             language: Language code (default: en)
             mode: AEO or GEO mode
             context: Additional context data from audit
+            site_city: City the site serves (truncated to 60 chars)
+            generated_at: ISO timestamp to stamp the post with; batch callers
+                can compute it once and pass it in (default: now)
             
         Returns:
-            Dict containing the complete blog post with schema markup
+            Dict containing the complete blog post with schema markup.
         """
         
-        self.language = language
-        self.brand_name = brand_name
-        self.target_keyword = target_keyword
-        self.mode = mode.upper()
-        self.site_city = site_city
-        
-        # Generate content based on mode
-        if self.mode == "AEO":
-            return self._generate_aeo_content(context)
-        elif self.mode == "GEO":
-            return self._generate_geo_content(context)
-        else:
-            raise ValueError("Mode must be 'AEO' or 'GEO'")
+        return self._generate_one(brand_name, target_keyword, language, mode,
+                                  generated_at or _now_iso(), context, site_city)
     
-    def _generate_aeo_content(self, context: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Generate AEO-optimized content"""
+    def generate_blog_posts(self, requests: List[Tuple[str, str, str, str]]) -> List[Dict[str, Any]]:
+        """
+        Generate several blog posts sharing one timestamp
         
-        # AEO-specific content structure
-        title = f"{self.target_keyword}: Complete Guide | {self.brand_name}"
-        if self.language.startswith('lt'):
-            meta_description = f"{self.brand_name} - Išsamus {self.target_keyword} vadovas. Ekspertų patarimai, palyginimai ir patarimai. Pradėkite dabar!"
-        else:
-            meta_description = f"{self.brand_name} - Complete {self.target_keyword} guide. Expert insights, comparisons & tips. Start now!"
+        Args:
+            requests: (brand_name, target_keyword, language, mode) tuples
+            
+        Returns:
+            List of blog post dicts in request order
+        """
+        now_iso = _now_iso()
+        return [self._generate_one(b, k, l, m, now_iso) for b, k, l, m in requests]
+    
+    async def generate_blog_posts_async(self, requests: List[Tuple[str, str, str, str]]) -> List[Dict[str, Any]]:
+        """Run generate_blog_posts off the event loop"""
+        return await asyncio.to_thread(self.generate_blog_posts, requests)
+    
+    def generate_batch(self, requests: List[Tuple[str, str, str, str]],
+                       max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Generate a batch of posts across worker processes
         
-        # Generate sections
-        sections = self._generate_aeo_sections()
+        Batches smaller than _MIN_POOL_BATCH are generated in-process.
         
-        # Generate FAQs (≥5 items)
-        faqs = self._generate_aeo_faqs()
+        Args:
+            requests: (brand_name, target_keyword, language, mode) tuples
+            max_workers: Process count (default: CPU count)
+            
+        Returns:
+            List of blog post dicts in request order
+        """
+        if len(requests) < _MIN_POOL_BATCH:
+            return self.generate_blog_posts(requests)
         
-        # Generate images
-        images = self._generate_images()
+        now_iso = _now_iso()
+        jobs = [(b, k, l, m, now_iso) for b, k, l, m in requests]
+        workers = max_workers or os.cpu_count() or 1
+        # One contiguous slice per worker keeps each worker's caches warm
+        chunksize = max(1, len(jobs) // workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._render_one, jobs, chunksize=chunksize))
+    
+    def _render_one(self, job: Tuple[str, str, str, str, str]) -> Dict[str, Any]:
+        """Unpack a batch job for executor.map"""
+        return self._generate_one(*job)
+    
+    @staticmethod
+    def to_json(post: Dict[str, Any]) -> str:
+        """Serialize a generated post (plain str/int/list/dict values only)"""
+        return _dumps(post)
+    
+    def _generate_one(self,
+                      brand_name: str,
+                      target_keyword: str,
+                      language: str,
+                      mode: str,
+                      now_iso: str,
+                      context: Dict[str, Any] = None,
+                      site_city: str = None) -> Dict[str, Any]:
+        """Generate a single post stamped with the given ISO timestamp"""
         
-        # Generate internal links
-        internal_links = self._generate_internal_links()
+        brand_name = _bounded(brand_name, _MAX_BRAND, "brand_name")
+        target_keyword = _bounded(target_keyword, _MAX_KEYWORD, "target_keyword")
+        if site_city:
+            site_city = _bounded(site_city, _MAX_CITY, "site_city")
         
-        # Generate content (800-1200 words)
-        content = self._generate_aeo_content_text(sections, faqs)
+        # Generate content based on mode; only normalise case on a miss
+        generate = self._dispatch.get(mode)
+        if generate is None:
+            mode = mode.upper()
+            generate = self._dispatch.get(mode)
+            if generate is None:
+                raise ValueError("Mode must be 'AEO' or 'GEO'")
         
-        # Generate JSON-LD schemas
-        json_ld = self._generate_aeo_json_ld(faqs)
+        params = self._make_params(brand_name, target_keyword, language, site_city, now_iso)
+        post = generate(params, context)
         
-        return {
-            "title": title,
-            "meta_description": meta_description[:160],
-            "content": content,
-            "word_count": len(content.split()),
-            "sections": sections,
-            "faqs": faqs,
-            "images": images,
-            "internal_links": internal_links,
-            "json_ld": json_ld,
-            "mode": "AEO",
-            "target_keyword": self.target_keyword,
-            "brand": self.brand_name,
-            "language": self.language,
-            "generated_at": datetime.now().isoformat()
-        }
+        # Pre-rendered JSON-LD so callers can embed it without re-encoding
+        post["json_ld_str"] = _dumps(post["json_ld"])
+        return post
     
-    def _generate_geo_content(self, context: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Generate GEO-optimized content"""
-        
-        # GEO-specific content structure
-        title = f"{self.target_keyword} in {self._get_city_name()}: Local Guide | {self.brand_name}"
-        if self.language.startswith('lt'):
-            meta_description = f"{self.brand_name} - Geriausi {self.target_keyword} {self._get_city_name()}. Ekspertų vietinis vadovavimas ir patarimai. Apsilankykite šiandien!"
-        else:
-            meta_description = f"{self.brand_name} - Best {self.target_keyword} in {self._get_city_name()}. Expert local guidance & insights. Visit us today!"
+    def _make_params(self, brand_name: str, target_keyword: str, language: str,
+                     site_city: Optional[str], now_iso: str) -> PostParams:
+        """Resolve the per-post values once"""
+        city = self._get_city_name(target_keyword)
+        lang = language[:2]
+        if lang not in _LANG_REGISTRY:
+            lang = "en"
+        landmarks = self._get_landmarks(city)
+        return PostParams(
+            kw=target_keyword,
+            brand=brand_name,
+            language=language,
+            site_city=site_city,
+            now_iso=now_iso,
+            city=city,
+            landmarks=landmarks,
+            lang=lang,
+            pack=_LANG_REGISTRY[lang],
+            ctx={
+                "kw": target_keyword,
+                "brand": brand_name,
+                "city": city,
+                "landmarks": landmarks,
+                "site_city": site_city,
+            },
+        )
+    
+    def _generate_aeo_content(self, p: PostParams, context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Generate AEO-optimized content"""
         
-        # Generate sections
-        sections = self._generate_geo_sections()
+        # Generate sections and FAQs (≥5 items)
+        sections = self._generate_aeo_sections(p)
+        faqs = self._generate_aeo_faqs(p)
         
-        # Generate FAQs (≥5 items)
-        faqs = self._generate_geo_faqs()
+        # Generate content (800-1200 words)
+        content, word_count = self._generate_aeo_content_text(sections, faqs, p)
         
-        # Generate images
-        images = self._generate_images()
+        return self._build_result(
+            "AEO", p,
+            _AEO_TITLE.format_map(p.ctx),
+            _format_meta(p.pack.aeo_meta, p.ctx),
+            sections, faqs, content, word_count,
+            self._generate_aeo_json_ld(faqs, p),
+        )
+    
+    def _generate_geo_content(self, p: PostParams, context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Generate GEO-optimized content"""
         
-        # Generate internal links
-        internal_links = self._generate_internal_links()
+        # Generate sections and FAQs (≥5 items)
+        sections = self._generate_geo_sections(p)
+        faqs = self._generate_geo_faqs(p)
         
         # Generate content (1000-1400 words)
-        content = self._generate_geo_content_text(sections, faqs)
+        content, word_count = self._generate_geo_content_text(sections, faqs, p)
         
-        # Generate JSON-LD schemas
-        json_ld = self._generate_geo_json_ld(faqs, context)
-        
-        return {
+        return self._build_result(
+            "GEO", p,
+            _GEO_TITLE.format_map(p.ctx),
+            _format_meta(p.pack.geo_meta, p.ctx),
+            sections, faqs, content, word_count,
+            self._generate_geo_json_ld(faqs, p, context),
+            extra={"city": p.city},
+        )
+    
+    def _build_result(self, mode: str, p: PostParams, title: str, meta_description: str,
+                      sections: List[Section], faqs: List[FAQ], content: str, word_count: int,
+                      json_ld: Dict[str, Any], extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Assemble the post payload shared by AEO and GEO modes"""
+        result = {
             "title": title,
-            "meta_description": meta_description[:160],
+            "meta_description": meta_description,
             "content": content,
-            "word_count": len(content.split()),
-            "sections": sections,
-            "faqs": faqs,
-            "images": images,
-            "internal_links": internal_links,
+            "word_count": word_count,
+            "sections": [section._asdict() for section in sections],
+            "faqs": [faq._asdict() for faq in faqs],
+            "images": self._generate_images(p),
+            "internal_links": self._generate_internal_links(p),
             "json_ld": json_ld,
-            "mode": "GEO",
-            "target_keyword": self.target_keyword,
-            "brand": self.brand_name,
-            "language": self.language,
-            "city": self._get_city_name(),
-            "generated_at": datetime.now().isoformat()
+            "mode": mode,
+            "target_keyword": p.kw,
+            "brand": p.brand,
+            "language": p.language,
         }
+        if extra:
+            result.update(extra)
+        result["generated_at"] = p.now_iso
+        return result
     
-    def _generate_aeo_sections(self) -> List[Dict[str, str]]:
+    def _generate_aeo_sections(self, p: PostParams) -> List[Section]:
         """Generate AEO-optimized sections with expanded content in target language"""
-        if self.language.startswith('lt'):
-            return [
-                {
-                    "heading": f"Kas yra {self.target_keyword}?",
-                    "content": f"Suprasti {self.target_keyword} yra labai svarbu priimant pagrįstus sprendimus. {self.brand_name} teikia išsamius patarimus šia tema. Šis vadovas apima viską, ką reikia žinoti apie geriausių variantų paiešką, kainų palyginimą ir protingus sprendimus."
-                },
-                {
-                    "heading": f"{self.target_keyword} pagrindiniai privalumai",
-                    "content": f"Atraskite {self.target_keyword} privalumus ir kaip jie gali jums padėti. Mūsų {self.brand_name} ekspertai nustatė svarbiausius privalumus, įskaitant kokybę, patogumą ir vertę. Išsamiai aptarsime kiekvieną privalumą su tikrais pavyzdžiais ir palyginimais."
-                },
-                {
-                    "heading": f"Palyginimas: {self.target_keyword} vs alternatyvos",
-                    "content": f"Palyginkite {self.target_keyword} su kitais variantais, kad priimtumėte geriausią sprendimą. {self.brand_name} siūlo išsamius palyginimus, kurie padės jums apsispręsti. Apsvarstysime kainų skirtumus, kokybės variacijas ir prieinamumą skirtinguose variantuose."
-                },
-                {
-                    "heading": f"Kaip pasirinkti tinkamą {self.target_keyword}",
-                    "content": f"Išmokite kriterijus, kaip pasirinkti geriausią {self.target_keyword} jūsų poreikiams. {self.brand_name} teikia ekspertų vadovavimą, atsižvelgdama į biudžetą, kokybę ir asmeninius pageidavimus. Pateiksime žingsnis po žingsnio vadovą, kuris padės priimti teisingą sprendimą."
-                },
-                {
-                    "heading": f"Patarimai ir rekomendacijos",
-                    "content": f"Gaukite ekspertų patarimų ir rekomendacijų apie {self.target_keyword}. {self.brand_name} dalijasi vidinėmis žiniomis apie tai, ko ieškoti, kokių klaidų vengti ir kaip gauti geriausią vertę už savo pinigus."
-                },
-                {
-                    "heading": f"Išvados: {self.target_keyword} vadovas",
-                    "content": f"Priimkite pagrįstus sprendimus apie {self.target_keyword} su mūsų išsamiais vadovais. {self.brand_name} yra jūsų patikimas šaltinis ekspertų patarimams ir profesionaliam vadovavimui."
-                }
-            ]
-        else:  # English fallback
-            return [
-                {
-                    "heading": f"What is {self.target_keyword}?",
-                    "content": f"Understanding {self.target_keyword} is essential for making informed decisions. {self.brand_name} provides comprehensive insights into this topic. This guide covers everything you need to know about finding the best options, comparing prices, and making smart choices."
-                },
-                {
-                    "heading": f"Key Benefits of {self.target_keyword}",
-                    "content": f"Discover the advantages of {self.target_keyword} and how it can benefit you. Our experts at {self.brand_name} have identified the most important benefits including quality, convenience, and value. We'll explore each benefit in detail with real examples and comparisons."
-                },
-                {
-                    "heading": f"Comparison: {self.target_keyword} vs Alternatives",
-                    "content": f"Compare {self.target_keyword} with other options to make the best choice. {self.brand_name} offers detailed comparisons to help you decide. We'll look at price differences, quality variations, and availability across different options."
-                },
-                {
-                    "heading": f"How to Choose the Right {self.target_keyword}",
-                    "content": f"Learn the criteria for selecting the best {self.target_keyword} for your needs. {self.brand_name} provides expert guidance on factors like budget, quality, and personal preferences. We'll provide a step-by-step guide to help you make the right decision."
-                },
-                {
-                    "heading": f"Tips and Recommendations",
-                    "content": f"Get expert tips and recommendations for {self.target_keyword}. {self.brand_name} shares insider knowledge about what to look for, common mistakes to avoid, and how to get the best value for your money."
-                },
-                {
-                    "heading": f"Conclusion: {self.target_keyword} Guide",
-                    "content": f"Make informed decisions about {self.target_keyword} with our comprehensive guide. {self.brand_name} is your trusted source for expert insights and professional recommendations."
-                }
-            ]
+        templates = p.pack.aeo_sections
+        return list(_render_items(Section, templates, p.kw, p.brand, "", ""))
     
-    def _generate_geo_sections(self) -> List[Dict[str, str]]:
+    def _generate_geo_sections(self, p: PostParams) -> List[Section]:
         """Generate GEO-optimized sections with local references in target language"""
-        city = self._get_city_name()
-        landmarks = self._get_landmarks()
-        if self.language.startswith('lt'):
-            return [
-                {
-                    "heading": f"{self.target_keyword} {city}: Vietinis apžvalga",
-                    "content": f"Atraskite geriausias {self.target_keyword} galimybes {city}. {self.brand_name} teikia vietinius patarimus ir rekomendacijas {city} gyventojams. Nuo {landmarks}, mes jums padėsime per geriausias vietas ir kas daro kiekvieną sritį unikalią apsipirkimui."
-                },
-                {
-                    "heading": f"Geriausios {self.target_keyword} vietos {city}",
-                    "content": f"Raskite populiariausias {self.target_keyword} vietas {city}, įskaitant sritis šalia {landmarks}. {self.brand_name} geriau žino {city} ir gali rekomenduoti geriausias vietas pagal jūsų pageidavimus. Apžvelgsime prekybos centrus, vietines parduotuves ir paslėptas perlas."
-                },
-                {
-                    "heading": f"Interneto vs vietinis {self.target_keyword} {city}",
-                    "content": f"Palyginkite internetinius ir vietinius {self.target_keyword} patirtis {city}. {self.brand_name} padeda pasirinkti geriausią variantą jūsų poreikiams. Aptarsime vietinio apsipirkimo {city} privalumus lyginant su internetiniais variantais, įskaitant nedelsiant prieinamumą, asmeninį aptarnavimą ir vietinę ekspertizę."
-                },
-                {
-                    "heading": f"Vietinio {self.target_keyword} privalumai {city}",
-                    "content": f"Išmokite, kodėl vietinis {self.target_keyword} {city} siūlo unikalius privalumus. {self.brand_name} jungia jus su geriausiais vietiniais variantais ir paaiškina vietinių verslų {city} palaikymo privalumus. Apžvelgsime patogumą, vietines žinias ir bendruomenės palaikymą."
-                },
-                {
-                    "heading": f"Geriausi apsipirkimo laikai {city}",
-                    "content": f"Atraskite optimalius laikus apsilankyti {self.target_keyword} vietose {city}. {self.brand_name} dalijasi vidiniais patarimais apie tai, kada parduotuvės mažiau apkrautos, kada paprastai vyksta nuolaidos ir kaip suplanuoti apsipirkimo kelionę geriausiai."
-                },
-                {
-                    "heading": f"Išvados: {self.target_keyword} {city}",
-                    "content": f"Išnaudokite {self.target_keyword} {city} su mūsų vietiniu vadovu. {self.brand_name} yra jūsų patikimas partneris {city} ir esame įsipareigoję padėti rasti tiksliai tai, ko ieškote."
-                }
-            ]
-        else:  # English fallback
-            return [
-                {
-                    "heading": f"{self.target_keyword} in {city}: Local Overview",
-                    "content": f"Discover the best {self.target_keyword} options in {city}. {self.brand_name} provides local insights and recommendations for {city} residents. From {landmarks}, we'll guide you through the top locations and what makes each area unique for shopping."
-                },
-                {
-                    "heading": f"Top {self.target_keyword} Locations in {city}",
-                    "content": f"Find the most popular {self.target_keyword} spots in {city}, including areas near {landmarks}. {self.brand_name} knows {city} best and can recommend the best places based on your preferences. We'll cover shopping centers, local boutiques, and hidden gems."
-                },
-                {
-                    "heading": f"Online vs Local {self.target_keyword} in {city}",
-                    "content": f"Compare online and local {self.target_keyword} experiences in {city}. {self.brand_name} helps you choose the best option for your needs. We'll discuss the advantages of shopping locally in {city} versus online options, including immediate availability, personal service, and local expertise."
-                },
-                {
-                    "heading": f"Local {self.target_keyword} Benefits in {city}",
-                    "content": f"Learn why local {self.target_keyword} in {city} offers unique advantages. {self.brand_name} connects you with the best local options and explains the benefits of supporting local businesses in {city}. We'll cover convenience, local knowledge, and community support."
-                },
-                {
-                    "heading": f"Best Times to Shop in {city}",
-                    "content": f"Discover the optimal times to visit {self.target_keyword} locations in {city}. {self.brand_name} shares insider tips about when stores are less crowded, when sales typically occur, and how to plan your shopping trip for the best experience."
-                },
-                {
-                    "heading": f"Conclusion: {self.target_keyword} in {city}",
-                    "content": f"Make the most of {self.target_keyword} in {city} with our local guide. {self.brand_name} is your trusted partner in {city} and we're committed to helping you find exactly what you're looking for."
-                }
-            ]
+        templates = p.pack.geo_sections
+        return list(_render_items(Section, templates, p.kw, p.brand, p.city, p.landmarks))
     
-    def _generate_aeo_faqs(self) -> List[Dict[str, str]]:
+    def _generate_aeo_faqs(self, p: PostParams) -> List[FAQ]:
         """Generate AEO-optimized FAQs based on real user intent with Lithuanian People Also Ask style"""
-        if self.language.startswith('lt'):
-            return [
-                {
-                    "question": f"Kur pigiausia pirkti kvepalus Vilniuje?",
-                    "answer": f"Geriausios kainos kvepalams Vilniuje randamos {self.brand_name} parduotuvėse. Mes siūlome konkurencingas kainas su skaidriais įkainiais. Turime variantų kiekvienam biudžetui - nuo prieinamų iki premium pasirinkimų."
-                },
-                {
-                    "question": f"Ar galima nusipirkti kvepalų testerius?",
-                    "answer": f"Taip! {self.brand_name} siūlo kvepalų testerių galimybes, kad galėtumėte išbandyti prieš pirkdami. Suprantame, kaip svarbu rasti tinkamą variantą, ir mūsų ekspertai padės jums per visą procesą."
-                },
-                {
-                    "question": f"Kur gauti nišinius kvepalus Vilniuje?",
-                    "answer": f"{self.brand_name} specializuojasi tiek populiarių, tiek nišinių kvepalų srityje. Turime prieigą prie ekskluzyvių kolekcijų ir galime padėti rasti unikalius kvepalus, kurių nėra kitur. Mūsų ekspertai puikiai žino rinką."
-                },
-                {
-                    "question": f"Ar visi kvepalai autentiški?",
-                    "answer": f"Taip, {self.brand_name} garantuoja visų mūsų produktų autentiškumą. Dirbame tiesiogiai su patikrintais tiekėjais ir teikiame autentiškumo sertifikatus. Mūsų reputacija remiasi pasitikėjimu ir kokybės užtikrinimu."
-                },
-                {
-                    "question": f"Kur geriausia kvepalų pasirinkimas Vilniuje?",
-                    "answer": f"Geriausias kvepalų pasirinkimas Vilniuje yra {self.brand_name} parduotuvėse. Siūlome platų asortimentą, tinkantį skirtingiems biudžetams ir skoniams, su ekspertų vadovavimu, kuris padės jums pasirinkti."
-                },
-                {
-                    "question": f"Kada geriausia laikas pirkti kvepalus?",
-                    "answer": f"Geriausias laikas pirkti kvepalus yra per {self.brand_name} akcijas ir specialius pasiūlymus. Reguliariai organizuojame nuolaidas ir sezoninius pasiūlymus, kurie puikiai tinka Vilniaus pirkėjams."
-                }
-            ]
-        else:  # English fallback
-            return [
-                {
-                    "question": f"What are the best options for {self.target_keyword}?",
-                    "answer": f"When looking for the best options, {self.brand_name} recommends considering quality, price, and availability. We offer a wide range of options to suit different budgets and preferences, with expert guidance to help you choose."
-                },
-                {
-                    "question": f"How much should I expect to pay?",
-                    "answer": f"Prices vary depending on quality and brand. {self.brand_name} offers competitive pricing with transparent quotes. We have options for every budget, from affordable choices to premium selections, ensuring you get the best value."
-                },
-                {
-                    "question": f"Are there any authentic options available?",
-                    "answer": f"Yes, {self.brand_name} guarantees authenticity for all our products. We work directly with verified suppliers and provide certificates of authenticity. Our reputation is built on trust and quality assurance."
-                },
-                {
-                    "question": f"Can I test before buying?",
-                    "answer": f"Absolutely! {self.brand_name} offers testing opportunities so you can try before you buy. We understand the importance of finding the right fit, and our experts are available to guide you through the testing process."
-                },
-                {
-                    "question": f"What about niche or specialty options?",
-                    "answer": f"{self.brand_name} specializes in both popular and niche options. We have access to exclusive collections and can help you find unique items that aren't available elsewhere. Our experts know the market inside and out."
-                },
-                {
-                    "question": f"Where can I find the cheapest options?",
-                    "answer": f"For budget-conscious shoppers, {self.brand_name} offers several affordable options without compromising quality. We regularly have sales and special offers, and our team can help you find the best deals available."
-                }
-            ]
+        templates = p.pack.aeo_faqs
+        return list(_render_items(FAQ, templates, p.kw, p.brand, "", ""))
     
-    def _generate_geo_faqs(self) -> List[Dict[str, str]]:
+    def _generate_geo_faqs(self, p: PostParams) -> List[FAQ]:
         """Generate GEO-optimized FAQs with local focus in target language"""
-        city = self._get_city_name()
-        landmarks = self._get_landmarks()
-        if self.language.startswith('lt'):
-            return [
-                {
-                    "question": f"Kur galiu rasti geriausius variantus {city}?",
-                    "answer": f"{self.brand_name} turi kelias vietas visoje {city}, įskaitant sritis šalia {landmarks}. Galime rekomenduoti geriausias vietas pagal jūsų pageidavimus ir suteikti išsamias instrukcijas į mūsų parduotuves."
-                },
-                {
-                    "question": f"Kokie privalumai apsipirkti vietiniame vs internete?",
-                    "answer": f"Apsipirkimas vietiniame {city} su {self.brand_name} siūlo nedelsiant prieinamumą, asmeninį aptarnavimą ir vietinę ekspertizę. Galite pamatyti, paliesti ir išbandyti produktus prieš pirkdami, plius gauti momentinius ekspertų patarimus iš mūsų {city} komandos."
-                },
-                {
-                    "question": f"Ar yra specialių pasiūlymų {city} gyventojams?",
-                    "answer": f"Taip, {self.brand_name} siūlo ekskluzyvius pasiūlymus {city} gyventojams, įskaitant vietines nuolaidas ir specialius pasiūlymus. Taip pat turime lojalumo programas ir sezoninius pasiūlymus, kurie puikiai tinka {city} pirkėjams."
-                },
-                {
-                    "question": f"Ar galiu gauti tą pačią dieną paslaugą {city}?",
-                    "answer": f"Žinoma! {self.brand_name} teikia tą pačią dieną paslaugas visoje {city}. Mūsų vietinė komanda užtikrina greitą apdorojimą ir dažnai gali prisitaikyti prie skubų {city} klientų prašymų."
-                },
-                {
-                    "question": f"Kuo {self.brand_name} skiriasi nuo kitų variantų {city}?",
-                    "answer": f"{self.brand_name} išsiskiria {city} su savo vietine ekspertize, individualizuotu aptarnavimu ir giliu {city} unikalių poreikių supratimu. Mes ne tik dar viena grandinė - mes esame {city} bendruomenės dalis."
-                },
-                {
-                    "question": f"Ar teikiate pristatymą visoje {city}?",
-                    "answer": f"Taip, {self.brand_name} teikia išsamias pristatymo paslaugas visoje {city}, įskaitant sritis šalia {landmarks}. Užtikriname greitą, patikimą pristatymą su sekimu ir klientų palaikymu iš mūsų {city} komandos."
-                }
-            ]
-        else:  # English fallback
-            return [
-                {
-                    "question": f"Where can I find the best options in {city}?",
-                    "answer": f"{self.brand_name} has multiple locations throughout {city}, including areas near {landmarks}. We can recommend the best spots based on your preferences and provide detailed directions to our stores."
-                },
-                {
-                    "question": f"What are the advantages of shopping locally vs online?",
-                    "answer": f"Shopping locally in {city} with {self.brand_name} offers immediate availability, personal service, and local expertise. You can see, touch, and test products before buying, plus get instant expert advice from our {city} team."
-                },
-                {
-                    "question": f"Are there any special offers for {city} residents?",
-                    "answer": f"Yes, {self.brand_name} offers exclusive deals for {city} residents, including local discounts and special promotions. We also have loyalty programs and seasonal offers that are perfect for {city} shoppers."
-                },
-                {
-                    "question": f"Can I get same-day service in {city}?",
-                    "answer": f"Absolutely! {self.brand_name} provides same-day service throughout {city}. Our local team ensures fast turnaround times and can often accommodate urgent requests from {city} customers."
-                },
-                {
-                    "question": f"What makes {self.brand_name} different from other options in {city}?",
-                    "answer": f"{self.brand_name} stands out in {city} with our local expertise, personalized service, and deep understanding of {city}'s unique needs. We're not just another chain - we're part of the {city} community."
-                },
-                {
-                    "question": f"Do you offer delivery throughout {city}?",
-                    "answer": f"Yes, {self.brand_name} offers comprehensive delivery services throughout {city}, including to areas near {landmarks}. We ensure fast, reliable delivery with tracking and customer support from our {city} team."
-                }
-            ]
+        templates = p.pack.geo_faqs
+        return list(_render_items(FAQ, templates, p.kw, p.brand, p.city, p.landmarks))
     
-    def _generate_images(self) -> List[Dict[str, str]]:
+    def _generate_images(self, p: PostParams) -> List[Dict[str, str]]:
         """Generate image suggestions (≥2) with localized alt text"""
-        if self.language.startswith('lt'):
-            return [
-                {
-                    "alt": f"{self.target_keyword} vadovas Vilniuje",
-                    "src": f"/images/{self.target_keyword.lower().replace(' ', '-')}-overview.jpg",
-                    "caption": f"Išsamus {self.target_keyword} vadovas"
-                },
-                {
-                    "alt": f"{self.brand_name} kvepalų parduotuvė Vilniuje",
-                    "src": f"/images/{self.brand_name.lower().replace(' ', '-')}-services.jpg",
-                    "caption": f"{self.brand_name} profesionalūs kvepalų paslaugos Vilniuje"
-                }
-            ]
-        else:
-            return [
-                {
-                    "alt": f"{self.target_keyword} overview image",
-                    "src": f"/images/{self.target_keyword.lower().replace(' ', '-')}-overview.jpg",
-                    "caption": f"Comprehensive guide to {self.target_keyword}"
-                },
-                {
-                    "alt": f"{self.brand_name} {self.target_keyword} services",
-                    "src": f"/images/{self.brand_name.lower().replace(' ', '-')}-services.jpg",
-                    "caption": f"{self.brand_name} professional {self.target_keyword} services"
-                }
-            ]
+        return [image._asdict() for image in _render_images(p.kw, p.brand, p.lang)]
     
-    def _generate_internal_links(self) -> List[Dict[str, str]]:
+    def _generate_internal_links(self, p: PostParams) -> List[Dict[str, str]]:
         """Generate internal links (≥2) with localized anchor text"""
-        if self.language.startswith('lt'):
-            return [
-                {
-                    "text": f"Sužinokite daugiau apie {self.brand_name} paslaugas",
-                    "url": "/services",
-                    "anchor": "mūsų-paslaugos"
-                },
-                {
-                    "text": f"Susisiekite su {self.brand_name} konsultacijai",
-                    "url": "/contact",
-                    "anchor": "susisiekite-su-mumis"
-                }
-            ]
-        else:
-            return [
-                {
-                    "text": f"Learn more about {self.brand_name} services",
-                    "url": "/services",
-                    "anchor": "our-services"
-                },
-                {
-                    "text": f"Contact {self.brand_name} for consultation",
-                    "url": "/contact",
-                    "anchor": "get-in-touch"
-                }
-            ]
+        return [link._asdict() for link in _render_links(p.brand, p.lang)]
     
-    def _generate_aeo_content_text(self, sections: List[Dict], faqs: List[Dict]) -> str:
+    def _generate_aeo_content_text(self, sections: List[Section], faqs: List[FAQ], p: PostParams) -> Tuple[str, int]:
         """Generate AEO-optimized content text (1000-1200 words)"""
         
-        localized = self._get_localized_content()
+        ctx, pack = p.ctx, p.pack
+        localized = self._get_localized_content(p)
         
-        content = f"# {self.target_keyword}: Complete Guide\n\n"
+        buf = io.StringIO()
+        write = buf.write
+        write(_AEO_TITLE_MD.format_map(ctx))
         
         # Start with local problem statement, not generic greeting
-        if self.language.startswith('lt'):
-            content += f"{localized['intro_prefix']}. {self.brand_name} teikia ekspertų patarimus, kurie padės rasti geriausias kvepalų pirkimo galimybes Vilniuje."
-        else:
-            content += f"{localized['intro_prefix']}. {self.brand_name} provides expert guidance to help you find the best options."
+        write(pack.aeo_intro.format_map(ctx))
         
         # Add city mention for AEO (light GEO tie-in)
-        if self.site_city:
-            if self.language.startswith('lt'):
-                content += f" Šiame vadove aptarsime geriausias {self.target_keyword} galimybes {self.site_city} ir apylinkėse.\n\n"
-            else:
-                content += f" This guide covers the best {self.target_keyword} options in {self.site_city} and surrounding areas.\n\n"
+        if p.site_city:
+            write(pack.aeo_city_intro.format_map(ctx))
         else:
-            content += "\n\n"
-        
-        # Add sections
-        for section in sections:
-            content += f"## {section['heading']}\n\n"
-            content += f"{section['content']}\n\n"
+            write("\n\n")
         
-        # Add FAQ section
-        content += f"## {localized['faq_heading']}\n\n"
-        for faq in faqs:
-            content += f"### {faq['question']}\n\n"
-            content += f"{faq['answer']}\n\n"
+        self._write_sections_and_faqs(buf, sections, faqs, localized)
         
-        content += f"## {localized['conclusion']}\n\n"
-        content += f"Suprasti {self.target_keyword} yra labai svarbu priimant pagrįstus sprendimus. {self.brand_name} yra jūsų patikimas partneris, teikiantis ekspertų patarimus ir profesionalias paslaugas.\n\n"
+        write("## ")
+        write(localized['conclusion'])
+        write("\n\n")
+        write(_AEO_CONCLUSION_MD.format_map(ctx))
         
         # Ensure minimum word count (1000-1200 for AEO)
-        content = self._ensure_word_count(content, 1000)
-        
-        return content
+        word_count = self._ensure_word_count(buf, 1000, p)
+        return buf.getvalue(), word_count
     
-    def _generate_geo_content_text(self, sections: List[Dict], faqs: List[Dict]) -> str:
+    def _generate_geo_content_text(self, sections: List[Section], faqs: List[FAQ], p: PostParams) -> Tuple[str, int]:
         """Generate GEO-optimized content text (1200-1500 words) in target language"""
         
-        localized = self._get_localized_content()
-        city = self._get_city_name()
-        
-        if self.language.startswith('lt'):
-            content = f"# {self.target_keyword} {city}: Vietinis vadovas\n\n"
-            content += f"Atraskite geriausias {self.target_keyword} galimybes {city}. {self.brand_name} teikia vietinę ekspertizę ir įžvalgas {city} gyventojams.\n\n"
-        else:
-            content = f"# {self.target_keyword} in {city}: Local Guide\n\n"
-            content += f"Discover the best {self.target_keyword} options in {city}. {self.brand_name} provides local expertise and insights for {city} residents.\n\n"
+        ctx, pack = p.ctx, p.pack
+        localized = self._get_localized_content(p)
         
-        # Add sections
-        for section in sections:
-            content += f"## {section['heading']}\n\n"
-            content += f"{section['content']}\n\n"
+        buf = io.StringIO()
+        write = buf.write
+        write(pack.geo_title_md.format_map(ctx))
+        write(pack.geo_intro.format_map(ctx))
         
-        # Add FAQ section
-        content += f"## {localized['faq_heading']}\n\n"
-        for faq in faqs:
-            content += f"### {faq['question']}\n\n"
-            content += f"{faq['answer']}\n\n"
+        self._write_sections_and_faqs(buf, sections, faqs, localized)
         
         # Add conclusion
-        content += f"## {localized['conclusion']}\n\n"
-        if self.language.startswith('lt'):
-            content += f"Išnaudokite {self.target_keyword} {city} su mūsų vietiniu vadovu. {self.brand_name} yra jūsų patikimas partneris {city}.\n\n"
-        else:
-            content += f"Make the most of {self.target_keyword} in {city} with our local guide. {self.brand_name} is your trusted partner in {city}.\n\n"
+        write("## ")
+        write(localized['conclusion'])
+        write("\n\n")
+        write(pack.geo_conclusion.format_map(ctx))
         
         # Ensure minimum word count (1200-1500 for GEO)
-        content = self._ensure_word_count(content, 1200)
+        word_count = self._ensure_word_count(buf, 1200, p)
+        return buf.getvalue(), word_count
+    
+    @staticmethod
+    def _write_sections_and_faqs(buf: io.StringIO, sections: List[Section], faqs: List[FAQ],
+                                 localized: Dict[str, str]) -> None:
+        """Write section and FAQ markdown to buf"""
+        write = buf.write
+        for heading, content in sections:
+            write("## ")
+            write(heading)
+            write("\n\n")
+            write(content)
+            write("\n\n")
         
-        return content
+        write("## ")
+        write(localized['faq_heading'])
+        write("\n\n")
+        for question, answer in faqs:
+            write("### ")
+            write(question)
+            write("\n\n")
+            write(answer)
+            write("\n\n")
     
-    def _generate_aeo_json_ld(self, faqs: List[Dict]) -> Dict[str, Any]:
+    def _generate_aeo_json_ld(self, faqs: List[FAQ], p: PostParams) -> Dict[str, Any]:
         """Generate AEO JSON-LD schema"""
-        return {
-            "@context": "https://schema.org",
-            "@type": "Article",
-            "headline": f"{self.target_keyword}: Complete Guide",
-            "description": f"Comprehensive guide to {self.target_keyword} by {self.brand_name}",
-            "author": {
-                "@type": "Organization",
-                "name": self.brand_name
-            },
-            "publisher": {
-                "@type": "Organization",
-                "name": self.brand_name
-            },
-            "datePublished": datetime.now().isoformat(),
-            "mainEntity": {
-                "@type": "FAQPage",
-                "mainEntity": [
-                    {
-                        "@type": "Question",
-                        "name": faq["question"],
-                        "acceptedAnswer": {
-                            "@type": "Answer",
-                            "text": faq["answer"]
-                        }
-                    } for faq in faqs
-                ]
-            }
-        }
+        ctx = p.ctx
+        return self._article_skeleton(
+            _AEO_HEADLINE.format_map(ctx),
+            _AEO_DESCRIPTION.format_map(ctx),
+            p.brand,
+            p.now_iso,
+            faqs,
+        )
     
-    def _generate_geo_json_ld(self, faqs: List[Dict], context: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _generate_geo_json_ld(self, faqs: List[FAQ], p: PostParams, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Generate GEO JSON-LD schema with LocalBusiness"""
         
+        ctx, brand = p.ctx, p.brand
+        
         # Base article schema
-        article_schema = {
-            "@context": "https://schema.org",
-            "@type": "Article",
-            "headline": f"{self.target_keyword} in {self._get_city_name()}: Local Guide",
-            "description": f"Local guide to {self.target_keyword} in {self._get_city_name()} by {self.brand_name}",
-            "author": {
-                "@type": "Organization",
-                "name": self.brand_name
-            },
-            "publisher": {
-                "@type": "Organization",
-                "name": self.brand_name
-            },
-            "datePublished": datetime.now().isoformat(),
-            "mainEntity": {
-                "@type": "FAQPage",
-                "mainEntity": [
-                    {
-                        "@type": "Question",
-                        "name": faq["question"],
-                        "acceptedAnswer": {
-                            "@type": "Answer",
-                            "text": faq["answer"]
-                        }
-                    } for faq in faqs
-                ]
-            }
-        }
+        article_schema = self._article_skeleton(
+            _GEO_HEADLINE.format_map(ctx),
+            _GEO_DESCRIPTION.format_map(ctx),
+            brand,
+            p.now_iso,
+            faqs,
+        )
         
         # LocalBusiness schema (with empty fields if no data)
-        local_business = {
-            "@context": "https://schema.org",
-            "@type": "LocalBusiness",
-            "name": self.brand_name,
-            "description": f"{self.brand_name} provides {self.target_keyword} services",
-            "address": {
-                "@type": "PostalAddress",
-                "addressLocality": self._get_city_name(),
-                "addressCountry": "LT"  # Default to Lithuania
-            }
-        }
+        local_business = _LOCAL_BUSINESS_BASE.copy()
+        local_business["name"] = brand
+        local_business["description"] = _LB_DESCRIPTION.format_map(ctx)
+        local_business["address"] = {**_ADDRESS_BASE, "addressLocality": p.city}
         
         return {
             "article": article_schema,
             "local_business": local_business
         }
     
-    def _get_city_name(self) -> str:
+    def _article_skeleton(self, headline: str, description: str, brand: str, now_iso: str,
+                          faqs: List[FAQ]) -> Dict[str, Any]:
+        """Build the Article schema shared by AEO and GEO posts"""
+        schema = _ARTICLE_BASE.copy()
+        schema["headline"] = headline
+        schema["description"] = description
+        schema["author"] = {**_ORG_BASE, "name": brand}
+        schema["publisher"] = {**_ORG_BASE, "name": brand}
+        schema["datePublished"] = now_iso
+        schema["mainEntity"] = self._faq_main_entity(faqs)
+        return schema
+    
+    @staticmethod
+    def _faq_main_entity(faqs: List[FAQ]) -> Dict[str, Any]:
+        """Build the FAQPage entity from question/answer pairs"""
+        return {
+            "@type": _T_FAQPAGE,
+            "mainEntity": [
+                {
+                    "@type": _T_QUESTION,
+                    "name": faq.question,
+                    "acceptedAnswer": {
+                        "@type": _T_ANSWER,
+                        "text": faq.answer
+                    }
+                } for faq in faqs
+            ]
+        }
+    
+    def _get_city_name(self, target_keyword: str, context: Dict[str, Any] = None) -> str:
         """Get city name from context or detect from target keyword"""
-        if self.context and 'location' in self.context:
-            return self.context['location']
-        
-        # Try to detect city from target keyword
-        target_lower = self.target_keyword.lower()
-        if 'kaune' in target_lower or 'kaunas' in target_lower:
-            return "Kaunas"
-        elif 'vilniuje' in target_lower or 'vilnius' in target_lower:
-            return "Vilnius"
-        elif 'klaipėdoje' in target_lower or 'klaipeda' in target_lower:
-            return "Klaipėda"
-        elif 'šiauliuose' in target_lower or 'siauliai' in target_lower:
-            return "Šiauliai"
-        elif 'panevėžyje' in target_lower or 'panevezys' in target_lower:
-            return "Panevėžys"
+        if context and 'location' in context:
+            return context['location']
         
-        return "Vilnius"  # Default fallback
+        return _detect_city(target_keyword)
     
-    def _get_landmarks(self) -> str:
+    def _get_landmarks(self, city: str) -> str:
         """Get local landmarks for GEO content based on city"""
-        city = self._get_city_name()
-        if city == "Kaunas":
-            return "Akropolis, Mega, Laisvės alėja"
-        elif city == "Vilnius":
-            return "Akropolis, Panorama, Gedimino pr."
-        elif city == "Klaipėda":
-            return "Akropolis, Švyturys, Tiltų g."
-        elif city == "Šiauliai":
-            return "Saulės miestas, Tilžės g., Vilniaus g."
-        elif city == "Panevėžys":
-            return "Akropolis, Respublikos g., Smėlynės g."
-        else:
-            return "Akropolis, Panorama, Gedimino pr."  # Default
+        return _LANDMARKS.get(city, _DEFAULT_LANDMARKS)
     
-    def _get_localized_content(self) -> Dict[str, str]:
+    def _get_localized_content(self, p: PostParams) -> Dict[str, str]:
         """Get localized content based on language with proper Lithuanian examples"""
-        if self.language.startswith('lt'):
-            return {
-                'faq_heading': 'Dažniausiai užduodami klausimai',
-                'conclusion': 'Išvados',
-                'intro_prefix': 'Vilniaus pirkėjai dažnai klausia, kur geriausia įsigyti originalius kvepalus',
-                'benefits_heading': 'Pagrindiniai privalumai',
-                'comparison_heading': 'Palyginimas',
-                'tips_heading': 'Patarimai ir rekomendacijos',
-                'quality_heading': 'Kokybės vertinimas',
-                'value_heading': 'Vertės palyginimas',
-                'expert_heading': 'Ekspertų rekomendacijos'
-            }
-        else:  # Default to English
-            return {
-                'faq_heading': 'Frequently Asked Questions',
-                'conclusion': 'Conclusion',
-                'intro_prefix': 'Local buyers often ask where to find authentic products',
-                'benefits_heading': 'Key Benefits',
-                'comparison_heading': 'Comparison',
-                'tips_heading': 'Tips and Recommendations',
-                'quality_heading': 'Quality Assessment',
-                'value_heading': 'Value Comparison',
-                'expert_heading': 'Expert Recommendations'
-            }
+        return p.pack.localized
     
-    def _ensure_word_count(self, content: str, min_words: int) -> str:
-        """Ensure content meets minimum word count by expanding with examples and tips"""
-        word_count = len(content.split())
+    def _ensure_word_count(self, buf: io.StringIO, min_words: int, p: PostParams) -> int:
+        """Ensure content meets minimum word count by expanding with examples and tips
+        
+        Writes the expansion to buf when needed and returns the final word count.
+        """
+        word_count = len(buf.getvalue().split())
         if word_count < min_words:
             # Add expansion content in target language
-            if self.language.startswith('lt'):
-                expansion = f"""
-                
-                ## Papildomi įžvalgos ir patarimai
-
-                Apsvarstydami savo variantus, svarbu įvertinti kelis pagrindinius veiksnius:
-
-                **Kokybės vertinimas**: Ieškokite kokybės rodiklių, tokių kaip medžiagos, meistriškumas ir prekės ženklo reputacija. {self.brand_name} palaiko aukštus standartus visuose mūsų pasiūlymuose.
-
-                **Vertės palyginimas**: Palyginkite ne tik kainą, bet ir vertę - ką gaunate už savo investiciją. Apsvarstykite ilgalaikius privalumus, patvarumą ir bendrą pasitenkinimą.
-
-                **Ekspertų rekomendacijos**: Mūsų {self.brand_name} komanda turi didelę patirtį ir gali suteikti individualizuotas rekomendacijas, atsižvelgdama į jūsų specifinius poreikius ir pageidavimus.
-
-                **Klientų atsiliepimai**: Skaitykite autentiškus atsiliepimus iš kitų klientų, kurie priėmė panašius sprendimus. Jų patirtis gali suteikti vertingų įžvalgų.
-
-                **Išbandymas ir testavimas**: Kada tik įmanoma, išbandykite ar paragaukite prieš priimdami galutinį sprendimą. {self.brand_name} siūlo įvairius būdus išbandyti mūsų produktus prieš pirkimą.
-
-                **Po pardavimo palaikymas**: Apsvarstykite palaikymą ir paslaugas, kurias gausite po pirkimo. {self.brand_name} teikia išsamų klientų aptarnavimą ir palaikymą.
-
-                **Ilgalaikiai svarstymai**: Pagalvokite, kaip jūsų pasirinkimas tarnaus jums laikui bėgant, ne tik iš karto. Kokybė ir patvarumas dažnai suteikia geresnę ilgalaikę vertę.
-
-                **Asmeniniai pageidavimai**: Jūsų individualūs poreikiai, stilius ir pageidavimai turėtų vadovauti jūsų sprendimui. {self.brand_name} siūlo įvairius variantus, tinkančius skirtingiems skoniams ir reikalavimams.
-
-                **Biudžeto planavimas**: Nustatykite realų biudžetą ir laikykitės jo, bet taip pat apsvarstykite kokybės investavimo vertę. Kartais šiek tiek daugiau išleisti iš karto ilgainiui sutaupo pinigų.
-
-                **Tyrimai ir švietimas**: Skirkite laiko išmokti apie savo variantus. {self.brand_name} teikia švietimo išteklius ir ekspertų vadovavimą, kuris padės priimti pagrįstus sprendimus.
-                """
-            else:  # English fallback
-                expansion = f"""
-                
-                ## Additional Insights and Tips
-
-                When considering your options, it's important to evaluate several key factors:
-
-                **Quality Assessment**: Look for indicators of quality such as materials, craftsmanship, and brand reputation. {self.brand_name} maintains high standards across all our offerings.
-
-                **Value Comparison**: Compare not just price, but value - what you get for your investment. Consider long-term benefits, durability, and overall satisfaction.
-
-                **Expert Recommendations**: Our team at {self.brand_name} has extensive experience and can provide personalized recommendations based on your specific needs and preferences.
-
-                **Customer Reviews**: Read authentic reviews from other customers who have made similar choices. Their experiences can provide valuable insights.
-
-                **Trial and Testing**: Whenever possible, test or sample before making a final decision. {self.brand_name} offers various ways to experience our products before purchase.
-
-                **After-Sales Support**: Consider the support and service you'll receive after your purchase. {self.brand_name} provides comprehensive customer service and support.
-
-                **Long-term Considerations**: Think about how your choice will serve you over time, not just immediately. Quality and durability often provide better long-term value.
-
-                **Personal Preferences**: Your individual needs, style, and preferences should guide your decision. {self.brand_name} offers diverse options to suit different tastes and requirements.
-
-                **Budget Planning**: Set a realistic budget and stick to it, but also consider the value of investing in quality. Sometimes spending a bit more upfront saves money long-term.
-
-                **Research and Education**: Take time to learn about your options. {self.brand_name} provides educational resources and expert guidance to help you make informed decisions.
-                """
-            content += expansion
-        return content
+            expansion, expansion_words = _render_expansion(p.brand, p.lang)
+            buf.write(expansion)
+            word_count += expansion_words
+        return word_count
@@ -1,22 +1,29 @@
 # enhanced_audit.py - Advanced audit with JavaScript rendering support
+from __future__ import annotations
+
 import asyncio
-import httpx
+import functools
+import json
 import re
-from urllib.parse import urljoin, urlparse, urldefrag
-from bs4 import BeautifulSoup
-from w3lib.html import get_base_url
+from urllib.parse import urljoin, urlparse, urlsplit, urldefrag
 import tldextract
-import json
-from typing import List, Dict, Any, Set, Tuple, Optional
-import lxml.html
-import lxml.etree
-import extruct
-from playwright.async_api import async_playwright, Browser, Page
+from typing import TYPE_CHECKING, List, Dict, Any, Set, Tuple, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Playwright is imported where a browser is actually used, so importing this
+# module (e.g. from main.py) does not pay for it
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page, Route
 
 DEFAULT_TIMEOUT = 15
 MAX_CONCURRENCY = 8
 IMG_HEAD_LIMIT = 20
 LINK_CHECK_LIMIT = 100
+NETWORK_IDLE_WAIT_MS = 5000
 
 _phone_re = re.compile(r"(?:\+\d{1,3}\s?)?(?:\(?\d{1,4}\)?[\s.-]?)\d{3,4}[\s.-]?\d{3,4}")
 _address_hint_re = re.compile(r"\b(street|str\.|ul\.|avenue|ave\.|road|rd\.|g\.)\b|\b(Vilnius|Kaunas|Rīga|Riga|Tallinn|Warsaw|Warszawa|Kraków|Praha|Praague|Berlin|Munich|Paris|Lyon|Madrid|Barcelona|Lisboa|Lisbon|Roma|Milano|Amsterdam|Rotterdam|Brussels|Antwerpen)\b", re.I)
@@ -28,31 +35,94 @@ _a_prefix_re = re.compile(r"^\s*(A:|Answer:)", re.I)
 HEADERS = {
     "User-Agent": "AscentIQAuditBot/1.0 (+https://tryevika.com; contact: audit@tryevika.com)"
 }
+VIEWPORT = {"width": 1920, "height": 1080}
+# The audit reads the DOM only; image tags are still listed from their markup
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+
+# Everything _analyze_page_enhanced reads from the rendered DOM, in one evaluate call
+_PAGE_EXTRACT_JS = """
+    () => {
+        return {
+            title: document.title || '',
+            meta: document.querySelector('meta[name="description"]')?.content || '',
+            h1: Array.from(document.querySelectorAll('h1')).map(h => h.textContent?.trim() || ''),
+            h2: Array.from(document.querySelectorAll('h2')).map(h => h.textContent?.trim() || ''),
+            h3: Array.from(document.querySelectorAll('h3')).map(h => h.textContent?.trim() || ''),
+            lang: document.documentElement.lang || 'en',
+            canonical: document.querySelector('link[rel="canonical"]')?.href || '',
+            metaRobots: document.querySelector('meta[name="robots"]')?.content || '',
+            xRobotsTag: document.querySelector('meta[http-equiv="x-robots-tag"]')?.content || '',
+            hreflang: Array.from(document.querySelectorAll('link[rel="alternate"][hreflang]')).map(link => ({
+                hreflang: link.getAttribute('hreflang'),
+                href: link.href
+            })),
+            images: Array.from(document.querySelectorAll('img')).map(img => ({
+                src: img.src,
+                alt: img.alt || '',
+                loading: img.loading || '',
+                width: img.width || '',
+                height: img.height || '',
+                bytes: null
+            })),
+            wordCount: document.body.textContent?.trim().split(/\\s+/).length || 0,
+            links: Array.from(document.querySelectorAll('a[href]')).map(link => link.href),
+            schema: Array.from(document.querySelectorAll('script[type="application/ld+json"]')).map(script => script.textContent || '')
+        };
+    }
+"""
 
 def _norm(u: str) -> str:
     return urldefrag(u.strip())[0]
 
+@functools.lru_cache(maxsize=4096)
+def _tld_key(host: str) -> Tuple[str, str]:
+    e = tldextract.extract(host)
+    return (e.domain, e.suffix)
+
 def _same_site(seed: str, other: str) -> bool:
-    a, b = tldextract.extract(seed), tldextract.extract(other)
-    return (a.domain, a.suffix) == (b.domain, b.suffix)
+    # Most links stay on the seed's host; only compare registered domains otherwise
+    seed_host = urlsplit(seed).hostname or ""
+    other_host = urlsplit(other).hostname or ""
+    return seed_host == other_host or _tld_key(seed_host) == _tld_key(other_host)
+
+async def _block_heavy_resources(route: Route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def _new_context(browser: Browser) -> BrowserContext:
+    """One browser context per crawl with viewport and headers baked in"""
+    context = await browser.new_context(
+        viewport=VIEWPORT,
+        extra_http_headers=HEADERS,
+        user_agent=HEADERS["User-Agent"],
+    )
+    await context.route("**/*", _block_heavy_resources)
+    return context
+
+async def _settle(page: Page) -> None:
+    """Wait for the page to go network-idle instead of sleeping; slow beacons only cost a bounded wait"""
+    from playwright.async_api import TimeoutError as PlaywrightTimeout
+    
+    try:
+        await page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_WAIT_MS)
+    except PlaywrightTimeout:
+        pass
 
-async def _fetch_with_js(browser: Browser, url: str, timeout: int = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+async def _fetch_with_js(context: BrowserContext, url: str, timeout: int = DEFAULT_TIMEOUT) -> Dict[str, Any]:
     """Fetch page with JavaScript rendering using Playwright"""
     try:
-        page = await browser.new_page()
-        await page.set_viewport_size({"width": 1920, "height": 1080})
-        
-        # Set headers
-        await page.set_extra_http_headers(HEADERS)
+        page = await context.new_page()
         
         # Navigate with timeout
-        response = await page.goto(url, wait_until="networkidle", timeout=timeout * 1000)
+        response = await page.goto(url, wait_until="domcontentloaded", timeout=timeout * 1000)
         
         if not response:
             return {"status": None, "html": "", "headers": {}}
         
-        # Wait for content to load
-        await page.wait_for_timeout(2000)  # Wait 2 seconds for dynamic content
+        # Wait for dynamic content to render
+        await _settle(page)
         
         # Get the rendered HTML
         html = await page.content()
@@ -71,135 +141,91 @@ async def _fetch_with_js(browser: Browser, url: str, timeout: int = DEFAULT_TIME
         print(f"DEBUG: JavaScript rendering failed for {url}: {e}")
         return {"status": None, "html": "", "headers": {}, "error": str(e)}
 
-async def _extract_links_enhanced(page: Page, base_url: str, seed_url: str) -> Tuple[List[str], List[str]]:
-    """Enhanced link extraction that works with JavaScript-rendered content"""
-    try:
-        # Wait for links to be rendered
-        await page.wait_for_selector("a[href]", timeout=5000)
-        
-        # Extract all links
-        links = await page.evaluate("""
-            () => {
-                const links = Array.from(document.querySelectorAll('a[href]'));
-                return links.map(link => ({
-                    href: link.href,
-                    text: link.textContent?.trim() || '',
-                    isInternal: link.hostname === window.location.hostname
-                }));
-            }
-        """)
-        
-        internal_links = []
-        external_links = []
-        
-        for link in links:
-            href = link['href']
-            if not href or href.startswith('#') or href.startswith('javascript:'):
-                continue
-                
-            try:
-                # Normalize URL
-                full_url = urljoin(base_url, href)
-                full_url = _norm(full_url)
-                
-                if _same_site(seed_url, full_url):
-                    internal_links.append(full_url)
-                else:
-                    external_links.append(full_url)
-            except:
-                continue
-        
-        return list(set(internal_links)), list(set(external_links))
-        
-    except Exception as e:
-        print(f"DEBUG: Enhanced link extraction failed: {e}")
-        return [], []
+def _parse_json_ld(raw_scripts: List[str], url: str) -> List[Any]:
+    """Parse raw JSON-LD script bodies, logging the ones that are invalid"""
+    loads = orjson.loads if orjson is not None else json.loads
+    schema_data = []
+    for raw in raw_scripts:
+        try:
+            data = loads(raw)
+        except ValueError as e:  # orjson.JSONDecodeError is a ValueError too
+            print(f"DEBUG: Invalid JSON-LD on {url}: {e}")
+            continue
+        # Same filter as before: drop null/false/0/"" blocks, keep empty objects
+        if data or isinstance(data, (dict, list)):
+            schema_data.append(data)
+    return schema_data
 
-async def _analyze_page_enhanced(browser: Browser, url: str, seed: str) -> Dict[str, Any]:
+def _split_links(hrefs: List[str], base_url: str, seed_url: str) -> Tuple[List[str], List[str]]:
+    """Normalize rendered link hrefs and split them into internal/external"""
+    internal_links = []
+    external_links = []
+    
+    for href in hrefs:
+        if not href or href.startswith('#') or href.startswith('javascript:'):
+            continue
+            
+        try:
+            # Normalize URL
+            full_url = urljoin(base_url, href)
+            full_url = _norm(full_url)
+            
+            if _same_site(seed_url, full_url):
+                internal_links.append(full_url)
+            else:
+                external_links.append(full_url)
+        except:
+            continue
+    
+    return list(dict.fromkeys(internal_links)), list(dict.fromkeys(external_links))
+
+def _empty_page_result(url: str) -> Dict[str, Any]:
+    """Page result for a URL that could not be loaded (fresh nested lists/dicts each call)"""
+    return {
+        "url": url,
+        "status": None,
+        "title": "",
+        "meta": "",
+        "h1": [],
+        "h2": [],
+        "h3": [],
+        "lang": "en",
+        "canonical": url,
+        "meta_robots": None,
+        "x_robots_tag": None,
+        "hreflang": [],
+        "images": [],
+        "links": {"internal": [], "external": [], "broken_internal": []},
+        "schema": {"json_ld": [], "microdata": [], "opengraph": [], "rdfa": []},
+        "faq": [],
+        "nap": {"phone": "", "address": ""},
+        "a11y": {"images_missing_alt": 0},
+        "performance_hints": {"html_bytes": 0, "images_total_bytes_sampled": 0, "images_with_lazy": 0, "images_missing_dimensions": 0},
+        "word_count": 0,
+        "headers": {}
+    }
+
+async def _analyze_page_enhanced(context: BrowserContext, url: str, seed: str) -> Dict[str, Any]:
     """Enhanced page analysis with JavaScript rendering"""
     try:
-        page = await browser.new_page()
-        await page.set_viewport_size({"width": 1920, "height": 1080})
-        await page.set_extra_http_headers(HEADERS)
+        page = await context.new_page()
         
         # Navigate to page
-        response = await page.goto(url, wait_until="networkidle", timeout=DEFAULT_TIMEOUT * 1000)
+        response = await page.goto(url, wait_until="domcontentloaded", timeout=DEFAULT_TIMEOUT * 1000)
         
         if not response:
             await page.close()
-            return {
-                "url": url,
-                "status": None,
-                "title": "",
-                "meta": "",
-                "h1": [],
-                "h2": [],
-                "h3": [],
-                "lang": "en",
-                "canonical": url,
-                "meta_robots": None,
-                "x_robots_tag": None,
-                "hreflang": [],
-                "images": [],
-                "links": {"internal": [], "external": [], "broken_internal": []},
-                "schema": {"json_ld": [], "microdata": [], "opengraph": [], "rdfa": []},
-                "faq": [],
-                "nap": {"phone": "", "address": ""},
-                "a11y": {"images_missing_alt": 0},
-                "performance_hints": {"html_bytes": 0, "images_total_bytes_sampled": 0, "images_with_lazy": 0, "images_missing_dimensions": 0},
-                "word_count": 0,
-                "headers": {}
-            }
-        
-        # Wait for content to load
-        await page.wait_for_timeout(2000)
+            return _empty_page_result(url)
         
-        # Extract content using JavaScript
-        content = await page.evaluate("""
-            () => {
-                return {
-                    title: document.title || '',
-                    meta: document.querySelector('meta[name="description"]')?.content || '',
-                    h1: Array.from(document.querySelectorAll('h1')).map(h => h.textContent?.trim() || ''),
-                    h2: Array.from(document.querySelectorAll('h2')).map(h => h.textContent?.trim() || ''),
-                    h3: Array.from(document.querySelectorAll('h3')).map(h => h.textContent?.trim() || ''),
-                    lang: document.documentElement.lang || 'en',
-                    canonical: document.querySelector('link[rel="canonical"]')?.href || '',
-                    metaRobots: document.querySelector('meta[name="robots"]')?.content || '',
-                    xRobotsTag: document.querySelector('meta[http-equiv="x-robots-tag"]')?.content || '',
-                    hreflang: Array.from(document.querySelectorAll('link[rel="alternate"][hreflang]')).map(link => ({
-                        hreflang: link.getAttribute('hreflang'),
-                        href: link.href
-                    })),
-                    images: Array.from(document.querySelectorAll('img')).map(img => ({
-                        src: img.src,
-                        alt: img.alt || '',
-                        loading: img.loading || '',
-                        width: img.width || '',
-                        height: img.height || '',
-                        bytes: null
-                    })),
-                    wordCount: document.body.textContent?.trim().split(/\\s+/).length || 0
-                };
-            }
-        """)
+        # Wait for dynamic content to render
+        await _settle(page)
         
-        # Extract links
-        internal_links, external_links = await _extract_links_enhanced(page, url, seed)
+        # Extract content, links and raw schema markup in one round-trip
+        content = await page.evaluate(_PAGE_EXTRACT_JS)
         
-        # Extract schema markup
-        schema_data = await page.evaluate("""
-            () => {
-                const scripts = Array.from(document.querySelectorAll('script[type="application/ld+json"]'));
-                return scripts.map(script => {
-                    try {
-                        return JSON.parse(script.textContent);
-                    } catch (e) {
-                        return null;
-                    }
-                }).filter(Boolean);
-            }
-        """)
+        # Split links
+        internal_links, external_links = _split_links(content.get("links", []), url, seed)
+        schema_data = _parse_json_ld(content.get("schema", []), url)
         
         await page.close()
         
@@ -244,29 +270,36 @@ async def _analyze_page_enhanced(browser: Browser, url: str, seed: str) -> Dict[
         
     except Exception as e:
         print(f"DEBUG: Enhanced page analysis failed for {url}: {e}")
-        return {
-            "url": url,
-            "status": None,
-            "title": "",
-            "meta": "",
-            "h1": [],
-            "h2": [],
-            "h3": [],
-            "lang": "en",
-            "canonical": url,
-            "meta_robots": None,
-            "x_robots_tag": None,
-            "hreflang": [],
-            "images": [],
-            "links": {"internal": [], "external": [], "broken_internal": []},
-            "schema": {"json_ld": [], "microdata": [], "opengraph": [], "rdfa": []},
-            "faq": [],
-            "nap": {"phone": "", "address": ""},
-            "a11y": {"images_missing_alt": 0},
-            "performance_hints": {"html_bytes": 0, "images_total_bytes_sampled": 0, "images_with_lazy": 0, "images_missing_dimensions": 0},
-            "word_count": 0,
-            "headers": {}
-        }
+        return _empty_page_result(url)
+
+_playwright = None
+_browser: Optional[Browser] = None
+_browser_loop: Optional[asyncio.AbstractEventLoop] = None
+_browser_lock = asyncio.Lock()
+
+async def get_browser() -> Browser:
+    """Launch headless Chromium once and share it across audits"""
+    global _playwright, _browser, _browser_loop
+    async with _browser_lock:
+        loop = asyncio.get_running_loop()
+        if _browser is None or _browser_loop is not loop or not _browser.is_connected():
+            from playwright.async_api import async_playwright
+            
+            if _playwright is None or _browser_loop is not loop:
+                _playwright = await async_playwright().start()
+            _browser = await _playwright.chromium.launch(headless=True)
+            _browser_loop = loop
+        return _browser
+
+async def close_browser() -> None:
+    """Shut down the shared browser (called on app shutdown)"""
+    global _playwright, _browser, _browser_loop
+    async with _browser_lock:
+        if _browser is not None:
+            await _browser.close()
+        if _playwright is not None:
+            await _playwright.stop()
+        _playwright = _browser = _browser_loop = None
 
 async def enhanced_audit_site(seed_url: str, max_pages: int = 50, use_js: bool = True) -> Dict[str, Any]:
     """Enhanced audit with JavaScript rendering support"""
@@ -274,62 +307,72 @@ async def enhanced_audit_site(seed_url: str, max_pages: int = 50, use_js: bool =
         seed_url = _norm(seed_url)
         parsed = urlparse(seed_url)
         root = f"{parsed.scheme}://{parsed.netloc}"
-        visited: Set[str] = set()
-        queue: List[str] = []
         
         if use_js:
-            # Use Playwright for JavaScript rendering
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
+            # Use the shared Playwright browser for JavaScript rendering
+            browser = await get_browser()
+            
+            # Pages share one context per audit instead of a fresh one per URL
+            context = await _new_context(browser)
+            
+            try:
+                # Start with the seed URL
+                queue: asyncio.Queue = asyncio.Queue()
+                queue.put_nowait(seed_url)
+                seen: Set[str] = {seed_url}  # visited or queued
+                pages: List[Dict[str, Any]] = []
+                broken_site_links: Set[str] = set()
+                
+                # Up to MAX_CONCURRENCY pages render at once; appends to the
+                # shared lists happen between awaits so need no lock
+                async def _worker():
+                    while True:
+                        url = await queue.get()
+                        try:
+                            print(f"DEBUG: Processing {url} with JavaScript rendering")
+                            page_data = await _analyze_page_enhanced(context, url, seed_url)
+                            pages.append(page_data)
+                            
+                            # Add new internal links to queue
+                            for next_url in page_data.get("links", {}).get("internal", []):
+                                if len(seen) >= max_pages:
+                                    break
+                                if next_url not in seen and _same_site(seed_url, next_url):
+                                    seen.add(next_url)
+                                    queue.put_nowait(next_url)
+                                    print(f"DEBUG: Added to queue: {next_url}")
+                        finally:
+                            queue.task_done()
+                
+                if max_pages > 0:
+                    workers = [asyncio.create_task(_worker()) for _ in range(min(MAX_CONCURRENCY, max_pages))]
+                    try:
+                        await queue.join()
+                    finally:
+                        for worker in workers:
+                            worker.cancel()
+                        await asyncio.gather(*workers, return_exceptions=True)
                 
-                try:
-                    # Start with the seed URL
-                    queue.append(seed_url)
-                    pages: List[Dict[str, Any]] = []
-                    broken_site_links: Set[str] = set()
-                    
-                    # Process pages with JavaScript rendering
-                    while queue and len(visited) < max_pages:
-                        url = queue.pop(0)
-                        if url in visited:
-                            continue
-                        visited.add(url)
-                        
-                        print(f"DEBUG: Processing {url} with JavaScript rendering")
-                        page_data = await _analyze_page_enhanced(browser, url, seed_url)
-                        pages.append(page_data)
-                        
-                        # Add new internal links to queue
-                        for next_url in page_data.get("links", {}).get("internal", []):
-                            if len(visited) + len(queue) >= max_pages:
-                                break
-                            if next_url not in visited and next_url not in queue and _same_site(seed_url, next_url):
-                                queue.append(next_url)
-                                print(f"DEBUG: Added to queue: {next_url}")
-                    
-                    await browser.close()
-                    
-                    # Build audit response
-                    discovered = len(pages)
-                    langs = list({p.get("lang") for p in pages if p.get("lang")})
-                    canonicals = sum(1 for p in pages if p.get("canonical"))
-                    
-                    return {
-                        "url": seed_url,
-                        "pages_discovered": discovered,
-                        "languages": langs,
-                        "pages_with_canonical": canonicals,
-                        "robots": {"raw": "", "disallow": [], "sitemaps": []},
-                        "pages_blocked_by_robots": 0,
-                        "meta_robots_summary": {"index": 0, "noindex": 0},
-                        "broken_internal_links_unique": sorted(list(broken_site_links)),
-                        "a11y_summary": {"images_missing_alt_total": 0},
-                        "pages": pages,
-                    }
-                    
-                except Exception as e:
-                    await browser.close()
-                    raise e
+                # Build audit response
+                discovered = len(pages)
+                langs = list({p.get("lang") for p in pages if p.get("lang")})
+                canonicals = sum(1 for p in pages if p.get("canonical"))
+                
+                return {
+                    "url": seed_url,
+                    "pages_discovered": discovered,
+                    "languages": langs,
+                    "pages_with_canonical": canonicals,
+                    "robots": {"raw": "", "disallow": [], "sitemaps": []},
+                    "pages_blocked_by_robots": 0,
+                    "meta_robots_summary": {"index": 0, "noindex": 0},
+                    "broken_internal_links_unique": sorted(list(broken_site_links)),
+                    "a11y_summary": {"images_missing_alt_total": 0},
+                    "pages": pages,
+                }
+            finally:
+                # Closes any pages left open by failed analyses too
+                await context.close()
         else:
             # Fallback to regular HTTP crawling
             from audit import audit_site
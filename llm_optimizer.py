@@ -1,412 +1,845 @@
 # llm_optimizer.py — LLM-powered optimization using OpenAI
 import os
+import asyncio
+import copy
+import hashlib
 import json
-from typing import Dict, Any, List
+import logging
+import math
+import random
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+from urllib.parse import urlparse
 from optimizer import optimize_site
-from llm_ruleset import get_optimization_guidelines, detect_industry_from_content, prioritize_recommendations
 
-# Initialize OpenAI client
+log = logging.getLogger(__name__)
+
 try:
-    import openai
-    openai.api_key = os.getenv("LLM_API_KEY")
+    import orjson
 except ImportError:
-    openai = None
+    orjson = None
 
-async def optimize_with_llm(audit_data: Dict[str, Any], scores: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Generate LLM-powered optimizations using OpenAI GPT-4o-mini
-    """
-    try:
-        # Get base optimizations first
-        print("DEBUG: Getting base optimizations...")
-        print(f"DEBUG: audit_data type: {type(audit_data)}")
-        print(f"DEBUG: scores type: {type(scores)}")
-        print(f"DEBUG: audit_data keys: {list(audit_data.keys()) if isinstance(audit_data, dict) else 'Not a dict'}")
-        print(f"DEBUG: scores keys: {list(scores.keys()) if isinstance(scores, dict) else 'Not a dict'}")
-        
-        # Get base optimizations but filter out sitemap URLs first
-        filtered_audit_data = audit_data.copy()
-        if "pages" in filtered_audit_data:
-            filtered_pages = []
-            for page in filtered_audit_data["pages"]:
-                if isinstance(page, dict):
-                    url = page.get('url', '')
-                    # Apply same filtering as LLM optimization
-                    technical_patterns = [
-                        'sitemap', 'robots.txt', '.xml', 'feed', 'rss', 'atom', 
-                        'sitemap.xml', 'post-sitemap', 'page-sitemap', 'tag-sitemap',
-                        'category-sitemap', 'product-sitemap', 'job-sitemap',
-                        'news-sitemap', 'image-sitemap', 'video-sitemap'
-                    ]
-                    is_technical_file = any(pattern in url.lower() for pattern in technical_patterns)
-                    has_technical_extension = any(url.lower().endswith(ext) for ext in ['.xml', '.txt', '.rss', '.atom'])
-                    
-                    if not (is_technical_file or has_technical_extension):
-                        filtered_pages.append(page)
-            filtered_audit_data["pages"] = filtered_pages
-        
-        base_optimizations = optimize_site(filtered_audit_data)
-        print(f"DEBUG: Base optimizations obtained successfully (filtered) - {len(base_optimizations.get('pages_optimized', []))} pages")
-        
-        # Check if OpenAI is available
-        if not openai:
-            print("OpenAI not available, using base optimizations")
-            return base_optimizations
-        
-        # Extract key information for LLM with safety checks
-        site_url = audit_data.get("url", "")
-        pages = audit_data.get("pages", [])
-        languages = audit_data.get("languages", [])
-        
-        # Ensure pages is a list and filter out non-dict items and sitemap URLs
-        if not isinstance(pages, list):
-            pages = []
-        pages = [p for p in pages if isinstance(p, dict)]
-        
-        # PROFESSIONAL-GRADE CONTENT FILTERING
-        content_pages = []
-        skipped_count = 0
-        
-        for page in pages:
-            url = page.get('url', '')
-            
-            # COMPREHENSIVE TECHNICAL FILE FILTERING
-            technical_patterns = [
-                'sitemap', 'robots.txt', '.xml', 'feed', 'rss', 'atom', 
-                'sitemap.xml', 'post-sitemap', 'page-sitemap', 'tag-sitemap',
-                'category-sitemap', 'product-sitemap', 'job-sitemap',
-                'news-sitemap', 'image-sitemap', 'video-sitemap'
-            ]
-            
-            # Check if URL contains any technical patterns
-            is_technical_file = any(pattern in url.lower() for pattern in technical_patterns)
-            
-            # Check if URL ends with technical extensions
-            technical_extensions = ['.xml', '.txt', '.rss', '.atom']
-            has_technical_extension = any(url.lower().endswith(ext) for ext in technical_extensions)
-            
-            # Skip all technical files
-            if is_technical_file or has_technical_extension:
-                skipped_count += 1
-                print(f"DEBUG: SKIPPING technical file: {url}")
-                continue
-            
-            # INCLUDE ANY PAGE THAT'S NOT A TECHNICAL FILE - NO CONTENT VALIDATION
-            content_pages.append(page)
-            print(f"DEBUG: INCLUDING content page: {url}")
-        
-        print(f"DEBUG: FILTERING COMPLETE - {len(content_pages)} content pages, {skipped_count} pages skipped")
-        
-        pages = content_pages
-        
-        # FINAL SAFETY CHECK - Remove any remaining sitemap URLs
-        final_pages = []
-        for page in pages:
-            url = page.get('url', '')
-            if 'sitemap' not in url.lower() and not url.endswith('.xml'):
-                final_pages.append(page)
-            else:
-                print(f"DEBUG: FINAL SAFETY - Removing sitemap URL: {url}")
-        
-        pages = final_pages
-        print(f"DEBUG: FINAL RESULT - {len(pages)} content pages ready for optimization")
-        
-        # If no content pages found, try with even more lenient criteria
-        if len(pages) == 0:
-            print("DEBUG: No content pages found - trying with ultra-lenient criteria")
-            ultra_lenient_pages = []
-            # Use original pages list, not the filtered one
-            original_pages = audit_data.get("pages", [])
-            for page in original_pages:
-                if not isinstance(page, dict):
-                    continue
-                url = page.get('url', '')
-                # Skip only obvious technical files
-                if any(ext in url.lower() for ext in ['.xml', '.txt', '.rss', '.atom']) or 'sitemap' in url.lower():
-                    continue
-                # Include ANY page that's not a technical file
-                ultra_lenient_pages.append(page)
-                print(f"DEBUG: ULTRA-LENIENT - Including page: {url}")
-            
-            if ultra_lenient_pages:
-                pages = ultra_lenient_pages
-                print(f"DEBUG: ULTRA-LENIENT RESULT - {len(pages)} pages ready for optimization")
-            else:
-                print("DEBUG: No pages found even with ultra-lenient criteria - returning base optimizations only")
-                return base_optimizations
-        
-        # Ensure languages is a list
-        if not isinstance(languages, list):
-            languages = []
-        
-        # Build context for LLM with safe access
-        scores_data = scores.get("scores", {}) if isinstance(scores, dict) else {}
-        context = {
-            "site_url": site_url,
-            "languages": languages,
-            "pages_count": len(pages),
-            "seo_score": scores_data.get("seo", 0),
-            "aeo_score": scores_data.get("aeo", 0),
-            "overall_score": scores_data.get("overall", 0)
-        }
-        
-        # Create LLM prompt with error handling
-        try:
-            print("DEBUG: Starting LLM prompt generation...")
-            # Safe string operations
-            languages_str = ', '.join(str(l) for l in languages) if languages else 'Unknown'
-            print(f"DEBUG: Languages processed: {languages_str}")
-            
-            # Count issues safely
-            print("DEBUG: Counting missing titles...")
-            missing_titles = len([p for p in pages if isinstance(p, dict) and not p.get('title')])
-            print(f"DEBUG: Missing titles: {missing_titles}")
-            
-            print("DEBUG: Counting missing meta...")
-            missing_meta = len([p for p in pages if isinstance(p, dict) and not p.get('meta')])
-            print(f"DEBUG: Missing meta: {missing_meta}")
-            
-            print("DEBUG: Counting missing H1...")
-            missing_h1 = len([p for p in pages if isinstance(p, dict) and not p.get('h1')])
-            print(f"DEBUG: Missing H1: {missing_h1}")
-            
-            print("DEBUG: Counting total images...")
-            total_images = sum(len(p.get('images', [])) for p in pages if isinstance(p, dict))
-            print(f"DEBUG: Total images: {total_images}")
-            
-            # Detect industry and get comprehensive optimization guidelines
-            industry = detect_industry_from_content(audit_data)
-            guidelines = get_optimization_guidelines(industry, "technical", "safe")
-            print(f"DEBUG: Detected industry: {industry}")
-            print(f"DEBUG: Using guidelines for: {industry}")
-            
-            # Build detailed page content for LLM analysis
-            page_details = []
-            for page in pages:  # Process ALL discovered pages for comprehensive optimization
-                # Safe access to page data with None checks
-                page_info = {
-                    'url': page.get('url', '') or '',
-                    'title': page.get('title', '') or '',
-                    'meta': page.get('meta', '') or '',
-                    'h1': page.get('h1', []) or [],
-                    'h2': page.get('h2', []) or [],
-                    'word_count': page.get('word_count', 0) or 0,
-                    'lang': page.get('lang', '') or '',
-                    'images_count': len(page.get('images', []) or [])
-                }
-                page_details.append(page_info)
-            
-            prompt = f"""
-You are an expert SEO and content optimization specialist following comprehensive professional guidelines. Analyze this website audit data and provide enhanced, actionable optimizations.
+try:
+    import httpx
+    from openai import AsyncOpenAI, APIConnectionError, InternalServerError, RateLimitError
+    # APITimeoutError is an APIConnectionError
+    _RETRYABLE_ERRORS: Tuple[type, ...] = (RateLimitError, APIConnectionError, InternalServerError)
+except ImportError:
+    httpx = None
+    AsyncOpenAI = None
+    _RETRYABLE_ERRORS = ()
 
-WEBSITE ANALYSIS:
-Website: {site_url}
-Languages: {languages_str}
-Content pages analyzed: {len(pages)} (excluding sitemaps and technical files)
-SEO Score: {scores_data.get('seo', 0)}/100
-AEO Score: {scores_data.get('aeo', 0)}/100
-Overall Score: {scores_data.get('overall', 0)}/100
+LLM_MODEL = "gpt-4o-mini"
+LLM_TEMPERATURE = 0.3
+# Output budget per request: the global block plus one fully filled pages_optimized entry per page
+LLM_BASE_TOKENS = 800
+LLM_TOKENS_PER_PAGE = 600
+# Pages are optimized in shards of LLM_PAGES_PER_REQUEST, LLM_CONCURRENCY requests at a time
+LLM_MAX_PAGES = 40
+LLM_PAGES_PER_REQUEST = max(int(os.getenv("LLM_PAGES_PER_REQUEST", "4") or 4), 1)
+LLM_CONCURRENCY = max(int(os.getenv("LLM_CONCURRENCY", "10") or 10), 1)
+SYSTEM_MSG = "You are an SEO expert. Return only valid JSON with optimization suggestions."
+LLM_PROMPT_CACHE_KEY = "seo-opt-v1"  # routes requests sharing SYSTEM_PREFIX to the same cache
+LLM_TIMEOUT = 45  # minimum bound on one completion, including SDK retries
+LLM_TOKENS_PER_SEC = 60  # conservative generation speed, stretches the bound for big budgets
+LLM_ATTEMPTS = 4
+LLM_MAX_RETRY_AFTER = 20  # cap, in seconds, on a 429's retry-after hint
+# Account rate limits; unset or 0 disables client-side throttling
+LLM_TPM = int(os.getenv("LLM_TPM", "0") or 0)
+LLM_RPM = int(os.getenv("LLM_RPM", "0") or 0)
 
-DETECTED INDUSTRY: {industry}
-OPTIMIZATION GUIDELINES: {guidelines['industry_template']}
+_json_loads = orjson.loads if orjson is not None else json.loads
 
-CURRENT ISSUES FOUND:
-- {missing_titles} pages missing titles
-- {missing_meta} pages missing meta descriptions
-- {missing_h1} pages missing H1 tags
-- {total_images} total images, many missing ALT text
 
-ACTUAL PAGE CONTENT TO ANALYZE:
-{page_details}
+def _json_dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
 
-PROFESSIONAL OPTIMIZATION RULES:
-1. COVER ALL CORE CATEGORIES: SEO, AEO, GEO, Accessibility, Technical, Performance, UX, Conversions, Content
-2. FOLLOW INDUSTRY-SPECIFIC TEMPLATES: {guidelines['industry_template']}
-3. PRIORITIZE HIGH-IMPACT, LOW-EFFORT OPTIMIZATIONS FIRST
-4. ENSURE COMPLIANCE WITH: Google Search Essentials, WCAG 2.1, Core Web Vitals, Schema.org
-5. BASE RECOMMENDATIONS ON ACTUAL CONTENT, NOT URL PATTERNS
-6. ONLY OPTIMIZE PAGES WITH SUBSTANTIAL CONTENT (title, meta, H1, or 50+ words)
-7. FOLLOW E-E-A-T PRINCIPLES (Experience, Expertise, Authoritativeness, Trustworthiness)
-8. IMPLEMENT STRUCTURED DATA APPROPRIATELY
-9. FOCUS ON USER INTENT AND PEOPLE-FIRST CONTENT
-10. PROVIDE ACTIONABLE, SPECIFIC RECOMMENDATIONS
-
-CRITICAL INSTRUCTIONS:
-- ONLY analyze pages that actually exist and have content
-- Base optimizations on ACTUAL content, not URL patterns
-- If a page has no title, meta, or H1, it likely doesn't exist - SKIP IT
-- Analyze real content to understand what the page is about
-- Do NOT make assumptions based on URL keywords
-- Only provide optimizations for pages with actual, relevant content
-- Follow industry-specific templates and guidelines
-- Prioritize recommendations by impact/effort matrix
-
-For each REAL content page that needs optimization, provide:
-1. Enhanced title (50-60 chars, keyword-rich, compelling)
-2. Meta description (150-160 chars, action-oriented)
-3. H1 tag (clear, keyword-focused)
-4. FAQ section (3-5 relevant questions with detailed answers)
-5. JSON-LD schema (Organization, LocalBusiness, or Product as appropriate)
-
-IMPORTANT: Provide optimizations for ALL pages that have content. Do not limit to just one page. 
-Each page should get its own optimization section with the page URL clearly identified.
-6. ALT text suggestions for images missing them
-
-Focus on:
-- Local SEO if business detected
-- E-commerce optimization if product pages found
-- Content authority and expertise
-- User intent matching
-- Technical SEO improvements
-
-Return as JSON with this structure:
-{{
-  "brand_guess": "detected brand name",
-  "global": {{
-    "new_title": "site-wide title template",
-    "new_meta": "site-wide meta template", 
-    "new_h1": "site-wide H1 template",
-    "faq": [{{"q": "question", "a": "answer"}}],
-    "json_ld": "Organization schema JSON-LD"
-  }},
-  "pages_optimized": [
-    {{
-      "url": "page_url",
-      "new_title": "optimized title",
-      "new_meta": "optimized meta description",
-      "new_h1": "optimized H1",
-      "faq": [{{"q": "question", "a": "answer"}}],
-      "json_ld": "page-specific JSON-LD",
-      "alt_text_suggestions": ["alt text for image1", "alt text for image2"],
-      "slug_suggestion": "improved-url-slug"
-    }}
-  ]
-}}
 
-Make all content production-ready and copy-pasteable.
-"""
-        except Exception as prompt_error:
-            print(f"Error generating prompt: {prompt_error}")
-            return base_optimizations
+def _json_dumps_sorted(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True).encode("utf-8")
 
-        # Call OpenAI API with simplified but comprehensive prompt
-        comprehensive_prompt = f"""
-You are an expert SEO consultant specializing in AI-driven search optimization (AEO), Geographic SEO (GEO), and traditional SEO. 
 
-Analyze this website: {site_url}
-Pages: {len(pages)} pages found
-Languages: {languages_str}
+# Sitemaps, robots.txt, feeds (incl. WordPress ?feed=rss2 and rss.php style
+# endpoints) and other non-content URLs. feed/rss/atom only count as whole path
+# segments, so pages like /feedback or /atomic-design stay in.
+_TECH_RE = re.compile(
+    r"sitemap|robots\.txt|(?:^|/)(?:feed|rss|atom)(?:\.php)?(?:[/?#]|$)|[?&]feed="
+    r"|\.(?:xml|txt|rss|atom)(?:$|[?#])",
+    re.IGNORECASE
+)
+
+_client: Optional["AsyncOpenAI"] = None
+_llm_semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+
+
+def _get_client() -> Optional["AsyncOpenAI"]:
+    """Lazily build the shared async OpenAI client (None when unavailable)"""
+    global _client
+    if _client is None and AsyncOpenAI is not None:
+        api_key = os.getenv("LLM_API_KEY")
+        if api_key:
+            # One pooled HTTP/2 connection set for every call: TLS sessions are reused
+            # and concurrent completions multiplex instead of queueing
+            http_client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60),
+                timeout=httpx.Timeout(30.0, connect=5.0)
+            )
+            # Retries are handled by _complete so they can back off with asyncio.sleep
+            _client = AsyncOpenAI(api_key=api_key, http_client=http_client, max_retries=0)
+    return _client
+
+
+async def close_llm_client() -> None:
+    """Close the shared OpenAI client and its connection pool (called on app shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+# Everything constant lives in the system message so every request shares one
+# long prefix for OpenAI prompt caching; only the audit data goes in the user message
+SYSTEM_PREFIX = SYSTEM_MSG + """
+
+You are an expert SEO consultant specializing in AI-driven search optimization (AEO), Geographic SEO (GEO), and traditional SEO. 
 
 For EACH discovered page, provide comprehensive optimization tasks organized by sector. This is for a future-focused SEO tool that prepares businesses for AI search, LLM optimization, and AEO.
 
 Return JSON format:
-{{
+{
   "pages_optimized": [
-    {{
+    {
       "url": "page_url",
       "page_type": "product|category|content|homepage|contact|about",
       "priority": "high|medium|low",
-      "basic_seo": {{
+      "basic_seo": {
         "new_title": "Optimized title (50-60 chars)",
         "new_meta": "Meta description (150-160 chars)",
         "new_h1": "H1 heading",
         "h2_suggestions": ["H2 suggestion 1", "H2 suggestion 2"],
         "h3_suggestions": ["H3 suggestion 1", "H3 suggestion 2"]
-      }},
-      "aeo_optimization": {{
+      },
+      "aeo_optimization": {
         "faq_suggestions": [
-          {{"question": "FAQ question 1", "answer": "Detailed answer 1"}},
-          {{"question": "FAQ question 2", "answer": "Detailed answer 2"}}
+          {"question": "FAQ question 1", "answer": "Detailed answer 1"},
+          {"question": "FAQ question 2", "answer": "Detailed answer 2"}
         ],
         "structured_data": "JSON-LD schema markup for this page type",
         "ai_friendly_content": "Content optimization suggestions for AI search",
         "answer_engine_tasks": ["Task 1", "Task 2", "Task 3"]
-      }},
-      "geo_optimization": {{
+      },
+      "geo_optimization": {
         "local_seo_tasks": ["Local SEO task 1", "Local SEO task 2"],
         "hreflang_suggestions": "Hreflang implementation suggestions",
         "location_signals": "Location-based optimization tasks",
         "geo_schema": "Geographic schema markup if applicable"
-      }},
-      "technical_seo": {{
+      },
+      "technical_seo": {
         "schema_markup": "Complete JSON-LD schema for this page",
         "canonical_suggestions": "Canonical URL recommendations",
         "internal_linking": "Internal linking strategy for this page",
         "technical_tasks": ["Technical task 1", "Technical task 2"]
-      }},
-      "content_optimization": {{
+      },
+      "content_optimization": {
         "content_gaps": ["Content gap 1", "Content gap 2"],
         "keyword_optimization": "Keyword optimization strategy",
         "content_structure": "Content structure improvements",
         "user_intent": "User intent optimization suggestions"
-      }},
-      "performance_tasks": {{
+      },
+      "performance_tasks": {
         "image_optimization": ["Image optimization task 1", "Image optimization task 2"],
         "speed_optimization": ["Speed optimization task 1", "Speed optimization task 2"],
         "mobile_optimization": ["Mobile optimization task 1", "Mobile optimization task 2"]
-      }},
-      "future_ai_optimization": {{
+      },
+      "future_ai_optimization": {
         "llm_search_preparation": "Tasks to prepare for LLM search",
         "ai_answer_optimization": "Optimize for AI answer snippets",
         "voice_search_optimization": "Voice search optimization tasks",
         "ai_crawlability": "AI crawler optimization tasks"
-      }}
-    }}
+      }
+    }
   ]
-}}
+}
 
 Focus on comprehensive, actionable tasks for each page that will help businesses rank in the evolving search landscape.
 """
+
+# Rendered with str.format_map
+AUDIT_DATA_TEMPLATE = """## Audit Data
+Analyze this website: {site_url}
+Pages: {pages_count} pages found
+Languages: {languages_str}
+Optimize only these {shard_count} pages, one pages_optimized entry each with its url:
+{page_details}
+"""
+
+
+class LLMCache:
+    """Exact-match cache of parsed LLM responses and base optimizations (process-local LRU with TTL)"""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 86400):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+    
+    @staticmethod
+    def make_key(model: str, system: str, prompt: str, temperature: float, max_tokens: int) -> str:
+        payload = _json_dumps_sorted(
+            {"m": model, "t": temperature, "max": max_tokens, "sys": system, "u": prompt}
+        )
+        return hashlib.sha256(payload).hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return a copy of the cached value, or None on a miss/expiry"""
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        # Callers mutate the result (merging base pages), so never hand out the stored object
+        return copy.deepcopy(entry[1])
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), copy.deepcopy(value))
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+_llm_cache = LLMCache()
+_base_cache = LLMCache(maxsize=256)
+# Final answers for an unchanged (audit, scores) pair; bump the version when
+# the output format changes so stale entries stop matching
+_result_cache = LLMCache(maxsize=1024, ttl=3600)
+RESULT_CACHE_VERSION = 1
+
+
+class TokenBucket:
+    """Async token bucket: refills at `rate` units per second up to `capacity`"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self, amount: float) -> None:
+        # A request larger than the bucket waits for a full bucket instead of forever
+        amount = min(amount, self.capacity)
+        # Waiters queue on the lock, so they are served in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+
+_tpm_bucket = TokenBucket(LLM_TPM / 60, LLM_TPM) if LLM_TPM > 0 else None
+_rpm_bucket = TokenBucket(LLM_RPM / 60, LLM_RPM) if LLM_RPM > 0 else None
+
+
+def _estimate_tokens(request: Dict[str, Any]) -> int:
+    """Rough TPM cost of a request: ~4 characters per prompt token plus the completion budget"""
+    prompt_chars = sum(len(msg["content"]) for msg in request["messages"])
+    return prompt_chars // 4 + request["max_tokens"]
+
+
+async def _throttle(request: Dict[str, Any]) -> None:
+    if _rpm_bucket is not None:
+        await _rpm_bucket.acquire(1)
+    if _tpm_bucket is not None:
+        await _tpm_bucket.acquire(_estimate_tokens(request))
+
+
+class SemanticCache:
+    """
+    Reuse a prior LLM answer for a near-identical re-audit of the same site.
+    
+    Entries are gated on a scope (host, languages and a digest of every page's
+    url/title/meta/h1, so fixing any page is a miss), then matched when each
+    remaining signature metric is within its tolerance. Entries expire after
+    ttl seconds.
+    """
+    
+    # Max absolute difference per signature metric: SEO score, AEO score, images per page
+    TOLERANCES = (2.0, 2.0, 0.5)
+    
+    def __init__(self, maxsize: int = 256, ttl: float = 3600):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "deque[Tuple[float, Tuple[Any, ...], Tuple[float, ...], Any]]" = deque(maxlen=maxsize)
+    
+    @staticmethod
+    def scope(site_url: str, languages: List[Any], pages: List[Dict[str, Any]]) -> Tuple[Any, ...]:
+        page_key = sorted(
+            (str(p.get('url') or ''), str(p.get('title') or ''), str(p.get('meta') or ''), str(p.get('h1') or ''))
+            for p in pages
+        )
+        return (urlparse(site_url).hostname or site_url, tuple(sorted(str(l) for l in languages)), _content_key(page_key))
+    
+    @staticmethod
+    def signature(pages_count: int, seo_score: float, aeo_score: float, total_images: int) -> Tuple[float, ...]:
+        return (float(seo_score or 0), float(aeo_score or 0), total_images / max(pages_count, 1))
+    
+    def get(self, scope: Tuple[Any, ...], sig: Tuple[float, ...]) -> Optional[Any]:
+        best, best_diff = None, math.inf
+        now = time.monotonic()
+        for expires, entry_scope, entry_sig, value in self._entries:
+            if entry_scope != scope or expires < now:
+                continue
+            # Largest difference relative to its tolerance; a match needs every metric within bounds
+            diff = max(abs(a - b) / tol for a, b, tol in zip(sig, entry_sig, self.TOLERANCES))
+            if diff <= 1 and diff < best_diff:
+                best, best_diff = value, diff
+        if best is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return copy.deepcopy(best)
+    
+    def set(self, scope: Tuple[Any, ...], sig: Tuple[float, ...], value: Any) -> None:
+        now = time.monotonic()
+        while self._entries and self._entries[0][0] < now:
+            self._entries.popleft()
+        self._entries.append((now + self.ttl, scope, sig, copy.deepcopy(value)))
+
+
+_semantic_cache = SemanticCache()
+
+
+def _content_key(obj: Any) -> Optional[str]:
+    """Digest of obj's canonical JSON, or None when it is not JSON-serializable"""
+    try:
+        return hashlib.blake2b(_json_dumps_sorted(obj), digest_size=16).hexdigest()
+    except TypeError:
+        return None
+
+
+async def _base_optimizations(audit_data: Dict[str, Any]) -> Dict[str, Any]:
+    """optimize_site in a worker thread, memoized on the audit content"""
+    key = _content_key(audit_data)
+    if key is None:
+        return await asyncio.to_thread(optimize_site, audit_data)
+    cached = _base_cache.get(key)
+    if cached is not None:
+        return cached
+    base_optimizations = await asyncio.to_thread(optimize_site, audit_data)
+    _base_cache.set(key, base_optimizations)
+    return base_optimizations
+
+
+# optimize_site page fields that describe the page as crawled and have no LLM counterpart
+_BASE_PAGE_FACTS = ("language", "word_count", "current_title", "current_meta", "current_h1")
+
+
+def _base_page_as_llm(base_page: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an optimize_site page ("suggestions" block) into the LLM pages_optimized schema"""
+    page = {key: base_page[key] for key in ("url",) + _BASE_PAGE_FACTS if key in base_page}
+    suggestions = base_page.get("suggestions") or {}
+    
+    basic_seo = {key: suggestions[key] for key in ("new_title", "new_meta", "new_h1") if key in suggestions}
+    if basic_seo:
+        page["basic_seo"] = basic_seo
+    
+    aeo = {}
+    faqs = [f for f in suggestions.get("faq") or [] if isinstance(f, dict)]
+    if faqs:
+        aeo["faq_suggestions"] = [{"question": f.get("q", ""), "answer": f.get("a", "")} for f in faqs]
+    if suggestions.get("faq_schema_jsonld"):
+        aeo["structured_data"] = suggestions["faq_schema_jsonld"]
+    if aeo:
+        page["aeo_optimization"] = aeo
+    
+    technical = {}
+    schema = suggestions.get("product_schema_jsonld") or suggestions.get("local_business_schema_jsonld")
+    if schema:
+        technical["schema_markup"] = schema
+    if suggestions.get("slug_suggestion"):
+        technical["technical_tasks"] = [f"Use a descriptive URL slug: {suggestions['slug_suggestion']}"]
+    if technical:
+        page["technical_seo"] = technical
+    
+    alts = [a for a in suggestions.get("alt_text_suggestions") or [] if isinstance(a, dict)]
+    if alts:
+        page["performance_tasks"] = {
+            "image_optimization": [f"Add alt text to {a.get('src', '')}: {a.get('suggested_alt', '')}" for a in alts]
+        }
+    return page
+
+
+async def _merge_base(llm_optimizations: Dict[str, Any], base_task: "asyncio.Task") -> Dict[str, Any]:
+    """
+    Complete the LLM answer from the base optimizer.
+    
+    Without LLM pages the base pages are used as they are. Otherwise base pages
+    are mapped into the LLM page schema (_base_page_as_llm) first: each LLM page,
+    matched by URL, gains the sections and fields it lacks without any that
+    conflict, and base pages the LLM has no entry for (a failed shard, or past
+    LLM_MAX_PAGES) are appended marked "fallback".
+    """
+    llm_pages = llm_optimizations.get("pages_optimized")
+    if not llm_pages:
+        base_optimizations = await base_task
+        llm_optimizations["pages_optimized"] = base_optimizations.get("pages_optimized", [])
+        return llm_optimizations
+    
+    try:
+        base_optimizations = await base_task
+    except Exception as e:
+        # The LLM answer stands on its own
+        log.debug("Base optimizations unavailable for merge: %s", e)
+        return llm_optimizations
+    
+    base_index = {
+        str(b["url"]).rstrip("/"): b
+        for b in base_optimizations.get("pages_optimized", [])
+        if isinstance(b, dict) and b.get("url")
+    }
+    answered = set()
+    for page in llm_pages:
+        if not isinstance(page, dict):
+            continue
+        url = str(page.get("url") or "").rstrip("/")
+        answered.add(url)
+        base_page = base_index.get(url)
+        if base_page:
+            for key, value in _base_page_as_llm(base_page).items():
+                current = page.setdefault(key, value)
+                if current is not value and isinstance(current, dict) and isinstance(value, dict):
+                    for sub_key, sub_value in value.items():
+                        current.setdefault(sub_key, sub_value)
+    llm_pages.extend(
+        dict(_base_page_as_llm(b), fallback=True) for url, b in base_index.items() if url not in answered
+    )
+    return llm_optimizations
+
+
+def _is_technical(url: str) -> bool:
+    return _TECH_RE.search(url) is not None
+
+
+def _content_pages(audit_data: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Tuple[int, int, int, int]]:
+    """
+    The audit's pages worth optimizing (dicts that are not sitemaps or other
+    technical files), plus (missing_titles, missing_meta, missing_h1,
+    total_images) over those pages, in a single pass
+    """
+    pages: List[Dict[str, Any]] = []
+    missing_titles = missing_meta = missing_h1 = total_images = 0
+    raw_pages = audit_data.get("pages", [])
+    if not isinstance(raw_pages, list):
+        raw_pages = []
+    
+    for page in raw_pages:
+        if not isinstance(page, dict):
+            continue
+        url = page.get('url') or ''
+        if _is_technical(url):
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Skipping technical file: %s", url)
+            continue
+        pages.append(page)
+        missing_titles += not page.get('title')
+        missing_meta += not page.get('meta')
+        missing_h1 += not page.get('h1')
+        imgs = page.get('images')
+        if imgs:
+            total_images += len(imgs)
+    
+    log.debug("Filtering complete: %d content pages, %d pages skipped", len(pages), len(raw_pages) - len(pages))
+    return pages, (missing_titles, missing_meta, missing_h1, total_images)
+
+
+def _page_summary(page: Dict[str, Any]) -> Dict[str, Any]:
+    """The page fields the model needs to optimize it"""
+    return {
+        'url': page.get('url', '') or '',
+        'title': page.get('title', '') or '',
+        'meta': page.get('meta', '') or '',
+        'h1': page.get('h1', []) or [],
+        'h2': page.get('h2', []) or [],
+        'word_count': page.get('word_count', 0) or 0,
+        'lang': page.get('lang', '') or '',
+        'images_count': len(page.get('images', []) or [])
+    }
+
+
+def _shard_pages(pages: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Split the pages to optimize (at most LLM_MAX_PAGES) into per-request shards"""
+    targets = pages[:LLM_MAX_PAGES]
+    return [targets[i:i + LLM_PAGES_PER_REQUEST] for i in range(0, len(targets), LLM_PAGES_PER_REQUEST)]
+
+
+def _audit_prompt(site_url: str, pages_count: int, languages_str: str, shard: List[Dict[str, Any]]) -> str:
+    """Build the user message (audit data) for one shard of a site's pages"""
+    return AUDIT_DATA_TEMPLATE.format_map({
+        "site_url": site_url,
+        "pages_count": pages_count,
+        "languages_str": languages_str,
+        "shard_count": len(shard),
+        "page_details": "\n".join(_json_dumps(_page_summary(p)) for p in shard)
+    })
+
+
+def _chat_body(prompt: str, max_tokens: int) -> Dict[str, Any]:
+    """Chat completion parameters shared by interactive and batch requests"""
+    return {
+        "model": LLM_MODEL,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PREFIX},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": max_tokens,
+        "temperature": LLM_TEMPERATURE,
+        "response_format": {"type": "json_object"}
+    }
+
+
+def _max_tokens_for(pages_count: int) -> int:
+    """Completion budget sized to the pages the model is asked to cover"""
+    return LLM_BASE_TOKENS + LLM_TOKENS_PER_PAGE * max(pages_count, 1)
+
+
+def _timeout_for(max_tokens: int) -> float:
+    return max(LLM_TIMEOUT, 15 + max_tokens / LLM_TOKENS_PER_SEC)
+
+
+def _matching_brace(text: str, start: int) -> int:
+    """Index of the brace closing the object opened at text[start], or -1 if unbalanced"""
+    depth = 0
+    in_string = escape = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
+def _extract_json(text: str) -> Any:
+    """
+    Parse the model's JSON answer. JSON mode makes the direct parse the normal
+    path; the brace scan only covers BOMs, code fences or prose around it.
+    
+    Raises ValueError (a json.JSONDecodeError) when no object can be recovered.
+    """
+    text = text.lstrip("\ufeff")
+    try:
+        return _json_loads(text)
+    except ValueError:  # orjson.JSONDecodeError is a ValueError too
+        pass
+    
+    # First balanced top-level object, skipping braces inside string literals
+    start = text.find("{")
+    if start != -1:
+        end = _matching_brace(text, start)
+        if end != -1:
+            try:
+                return _json_loads(text[start:end + 1])
+            except ValueError:
+                pass
+    raise json.JSONDecodeError("No JSON object in LLM response", text, 0)
+
+
+class _PageStreamParser:
+    """Incrementally pick finished objects out of a streamed "pages_optimized" array"""
+    
+    def __init__(self):
+        self.text = ""
+        self._pos = -1  # scan position inside the pages array, -1 until it is found
+        self._done = False
+    
+    def feed(self, delta: str) -> List[Dict[str, Any]]:
+        self.text += delta
+        if self._done:
+            return []
+        if self._pos < 0:
+            key = self.text.find('"pages_optimized"')
+            start = self.text.find("[", key) if key != -1 else -1
+            if start == -1:
+                return []
+            self._pos = start + 1
+        elif "}" not in delta:
+            # An object can only have closed if this delta closed a brace
+            return []
+        
+        pages = []
+        text = self.text
+        while True:
+            i = self._pos
+            while i < len(text) and text[i] in " \t\r\n,":
+                i += 1
+            if i >= len(text):
+                break
+            if text[i] == "]":
+                self._done = True
+                break
+            end = _matching_brace(text, i) if text[i] == "{" else -1
+            if end == -1:
+                break
+            try:
+                pages.append(_json_loads(text[i:end + 1]))
+            except ValueError:
+                pass
+            self._pos = end + 1
+        return pages
+
+
+async def _stream_completion(client: "AsyncOpenAI", request: Dict[str, Any],
+                             on_page: Callable[[Dict[str, Any]], Awaitable[None]]) -> str:
+    """Stream a chat completion, handing each finished pages_optimized item to on_page"""
+    stream = await client.chat.completions.create(stream=True, **request)
+    parser = _PageStreamParser()
+    async for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            for page in parser.feed(delta):
+                await on_page(page)
+    return parser.text
+
+
+def _share_strings(obj: Any, pool: Optional[Dict[str, str]] = None) -> Any:
+    """
+    Collapse equal string values in a parsed response onto one object.
+    
+    Pages repeat the same json_ld, templates and task strings; one copy is
+    kept per response (cached answers and deep copies keep the sharing).
+    """
+    if pool is None:
+        pool = {}
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if isinstance(value, str):
+                obj[key] = pool.setdefault(value, value)
+            elif isinstance(value, (dict, list)):
+                _share_strings(value, pool)
+    elif isinstance(obj, list):
+        for i, value in enumerate(obj):
+            if isinstance(value, str):
+                obj[i] = pool.setdefault(value, value)
+            elif isinstance(value, (dict, list)):
+                _share_strings(value, pool)
+    return obj
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds the API asked us to wait (retry-after-ms / retry-after headers on 429s), if any"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        pass  # an HTTP date; fall back to our own backoff
+    return None
+
+
+async def _complete(client: "AsyncOpenAI", request: Dict[str, Any], timeout: float,
+                    on_page: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None) -> str:
+    """
+    Run one chat completion, retrying transient API failures with jittered backoff.
+    
+    Each attempt holds an _llm_semaphore slot only while its request is in flight,
+    not while throttled or backing off.
+    """
+    emitted = 0
+    
+    async def forward(page: Dict[str, Any]) -> None:
+        nonlocal emitted
+        emitted += 1
+        await on_page(page)
+    
+    for attempt in range(LLM_ATTEMPTS):
+        await _throttle(request)
+        try:
+            async with _llm_semaphore:
+                if on_page is None:
+                    response = await asyncio.wait_for(client.chat.completions.create(**request), timeout=timeout)
+                    return response.choices[0].message.content
+                return await asyncio.wait_for(_stream_completion(client, request, forward), timeout=timeout)
+        except _RETRYABLE_ERRORS as e:
+            # Pages already handed to on_page cannot be taken back
+            if attempt == LLM_ATTEMPTS - 1 or emitted:
+                raise
+            backoff = min(8, 0.5 * 2 ** attempt) * (1 + random.random() * 0.2)
+            # Honor the server's hint when it asks for longer, within reason
+            backoff = max(backoff, min(_retry_after(e) or 0, LLM_MAX_RETRY_AFTER))
+            log.debug("LLM call failed (%s), retrying in %.1fs", type(e).__name__, backoff)
+            await asyncio.sleep(backoff)
+
+
+async def _optimize_shard(client: "AsyncOpenAI", site_url: str, pages_count: int, languages_str: str,
+                          shard: List[Dict[str, Any]], force_refresh: bool,
+                          on_page: Optional[Callable[[Dict[str, Any]], Awaitable[None]]]) -> List[Dict[str, Any]]:
+    """Optimize one shard of pages with a single completion; returns its pages_optimized entries"""
+    prompt = _audit_prompt(site_url, pages_count, languages_str, shard)
+    max_tokens = _max_tokens_for(len(shard))
+    
+    # Identical prompts get identical answers; skip the API call on a repeat
+    cache_key = LLMCache.make_key(LLM_MODEL, SYSTEM_PREFIX, prompt, LLM_TEMPERATURE, max_tokens)
+    cached = None if force_refresh else _llm_cache.get(cache_key)
+    if cached is not None:
+        log.debug("LLM cache hit (%d hits / %d misses)", _llm_cache.hits, _llm_cache.misses)
+        return cached
+    
+    timeout = _timeout_for(max_tokens)
+    request = dict(
+        _chat_body(prompt, max_tokens),
+        timeout=httpx.Timeout(timeout, connect=5.0),
+        extra_body={"prompt_cache_key": LLM_PROMPT_CACHE_KEY}
+    )
+    llm_content = await _complete(client, request, timeout, on_page)
+    
+    # Parse LLM response
+    llm_content = llm_content.strip()
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("LLM response length: %d, preview: %s...", len(llm_content), llm_content[:200])
+    
+    # JSON mode returns a bare object; _extract_json parses that directly and
+    # only scans when a reply is cut off or otherwise malformed
+    parsed = _share_strings(_extract_json(llm_content))
+    pages_optimized = parsed.get("pages_optimized") if isinstance(parsed, dict) else None
+    pages_optimized = [p for p in pages_optimized or [] if isinstance(p, dict)]
+    # An empty answer is not worth a day in the cache; let the next audit retry
+    if pages_optimized:
+        _llm_cache.set(cache_key, pages_optimized)
+    return pages_optimized
+
+
+async def optimize_with_llm(audit_data: Dict[str, Any], scores: Dict[str, Any], force_refresh: bool = False,
+                            on_page: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None) -> Dict[str, Any]:
+    """
+    Generate LLM-powered optimizations using OpenAI GPT-4o-mini
+    
+    Prior answers are reused for identical or near-identical audits unless
+    force_refresh is set. When on_page is given the completion is streamed and
+    each optimized page is passed to it as soon as the model finishes it.
+    """
+    try:
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("audit_data keys: %s", list(audit_data) if isinstance(audit_data, dict) else type(audit_data))
+            log.debug("scores keys: %s", list(scores) if isinstance(scores, dict) else type(scores))
+        
+        # An unchanged audit skips both the base optimizer and the LLM
+        result_key = _content_key([RESULT_CACHE_VERSION, audit_data, scores])
+        cached = None if force_refresh or result_key is None else _result_cache.get(result_key)
+        if cached is not None:
+            log.debug("Optimization result cache hit (%d hits / %d misses)", _result_cache.hits, _result_cache.misses)
+            return cached
+        
+        # One pass: content pages (no sitemaps etc.) and their issue counts
+        pages, (missing_titles, missing_meta, missing_h1, total_images) = _content_pages(audit_data)
         
-        response = openai.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are an SEO expert. Return only valid JSON with optimization suggestions."},
-                {"role": "user", "content": comprehensive_prompt}
-            ],
-            max_tokens=2000,
-            temperature=0.3
+        # Base optimizations are only a fallback/merge source; build them while the LLM runs
+        base_task = asyncio.create_task(_base_optimizations({**audit_data, "pages": pages}))
+        # Mark a failure as retrieved if the task is never awaited (e.g. the LLM call errors out)
+        base_task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        
+        # Check if OpenAI is available
+        client = _get_client()
+        if client is None:
+            log.warning("OpenAI not available, using base optimizations")
+            return await base_task
+        
+        # Extract key information for LLM with safety checks
+        site_url = audit_data.get("url", "")
+        languages = audit_data.get("languages", [])
+        if not pages:
+            log.debug("No content pages found - returning base optimizations only")
+            return await base_task
+        
+        # Ensure languages is a list
+        if not isinstance(languages, list):
+            languages = []
+        
+        scores_data = scores.get("scores", {}) if isinstance(scores, dict) else {}
+        languages_str = ', '.join(str(l) for l in languages) if languages else 'Unknown'
+        log.debug("Languages: %s; missing titles: %d, meta: %d, H1: %d; total images: %d",
+                  languages_str, missing_titles, missing_meta, missing_h1, total_images)
+
+        # A re-audit of unchanged pages (same titles/meta/H1) with near-equal scores gets the same answer
+        semantic_scope = SemanticCache.scope(site_url, languages, pages)
+        semantic_sig = SemanticCache.signature(
+            len(pages), scores_data.get("seo", 0), scores_data.get("aeo", 0), total_images
         )
+        cached = None if force_refresh else _semantic_cache.get(semantic_scope, semantic_sig)
+        if cached is not None:
+            log.debug("LLM semantic cache hit (%d hits / %d misses)", _semantic_cache.hits, _semantic_cache.misses)
+            return await _merge_base(cached, base_task)
         
-        # Parse LLM response
-        llm_content = response.choices[0].message.content.strip()
-        print(f"DEBUG: LLM response length: {len(llm_content)}")
-        print(f"DEBUG: LLM response preview: {llm_content[:200]}...")
+        # Call OpenAI once per shard of pages, concurrently (bounded by _llm_semaphore)
+        shards = _shard_pages(pages)
+        log.debug("Optimizing %d pages in %d LLM requests", sum(len(sh) for sh in shards), len(shards))
+        results = await asyncio.gather(
+            *(_optimize_shard(client, site_url, len(pages), languages_str, shard, force_refresh, on_page) for shard in shards),
+            return_exceptions=True
+        )
+        pages_optimized: List[Dict[str, Any]] = []
+        errors: List[BaseException] = []
+        for shard, result in zip(shards, results):
+            if isinstance(result, BaseException):
+                log.warning("LLM request for %d pages failed: %s", len(shard), result)
+                errors.append(result)
+            else:
+                pages_optimized.extend(result)
+        if len(errors) == len(shards):
+            if isinstance(errors[0], json.JSONDecodeError):  # orjson's decode error subclasses it
+                # Fallback to base optimizations if LLM response is invalid
+                log.warning("LLM response parsing failed, using base optimizations")
+                return await base_task
+            raise errors[0]
         
-        # Try to extract JSON from response
         try:
-            # Look for JSON block in response
-            if "```json" in llm_content:
-                json_start = llm_content.find("```json") + 7
-                json_end = llm_content.find("```", json_start)
-                json_str = llm_content[json_start:json_end].strip()
-            elif "```" in llm_content:
-                json_start = llm_content.find("```") + 3
-                json_end = llm_content.find("```", json_start)
-                json_str = llm_content[json_start:json_end].strip()
-            else:
-                json_str = llm_content
-            
-            llm_optimizations = json.loads(json_str)
+            llm_optimizations = {"pages_optimized": pages_optimized}
+            if not errors:
+                _semantic_cache.set(semantic_scope, semantic_sig, llm_optimizations)
             
             # Merge with base optimizations for fallback
-            if not llm_optimizations.get("pages_optimized"):
-                llm_optimizations["pages_optimized"] = base_optimizations.get("pages_optimized", [])
-            
+            llm_optimizations = await _merge_base(llm_optimizations, base_task)
+            if pages_optimized and not errors and result_key is not None:
+                _result_cache.set(result_key, llm_optimizations)
             return llm_optimizations
             
-        except json.JSONDecodeError:
-            # Fallback to base optimizations if LLM response is invalid
-            print(f"LLM response parsing failed, using base optimizations: {llm_content[:200]}...")
-            return base_optimizations
-            
         except Exception as e:
-            print(f"LLM optimization error: {e}")
+            log.warning("LLM optimization error: %s", e)
             # Fallback to base optimizations
             try:
                 return optimize_site(audit_data)
             except Exception as base_error:
-                print(f"Base optimization also failed: {base_error}")
+                log.error("Base optimization also failed: %s", base_error)
                 # Final fallback - return minimal optimizations for ANY website
                 return {
                     "pages_optimized": [{
@@ -421,9 +854,8 @@ Focus on comprehensive, actionable tasks for each page that will help businesses
                 }
             
     except Exception as e:
-        print(f"LLM optimization error: {e}")
         # Fallback to comprehensive format instead of old optimize_site
-        print(f"LLM optimization failed, using comprehensive fallback format")
+        log.error("LLM optimization failed, using comprehensive fallback format: %s", e)
         # Final fallback - return comprehensive optimizations for ANY website
         return {
                 "pages_optimized": [{
@@ -480,3 +912,123 @@ Focus on comprehensive, actionable tasks for each page that will help businesses
                 }],
                 "error": f"Fallback optimizations provided due to: {str(e)}"
             }
+
+
+async def stream_optimize_with_llm(audit_data: Dict[str, Any], scores: Dict[str, Any],
+                                   force_refresh: bool = False) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of optimize_with_llm for SSE-style route handlers.
+    
+    Yields {"page": ...} for each page as the model finishes it, then
+    {"result": ...} with the complete optimizations (which is all that is
+    yielded when the answer comes from a cache or a fallback).
+    """
+    queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+    task = asyncio.create_task(optimize_with_llm(audit_data, scores, force_refresh, on_page=queue.put))
+    task.add_done_callback(lambda _: queue.put_nowait(None))
+    try:
+        while (page := await queue.get()) is not None:
+            yield {"page": page}
+        yield {"result": await task}
+    finally:
+        task.cancel()
+
+
+async def submit_llm_batch(audits: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> str:
+    """
+    Queue many site audits as one OpenAI Batch API job (24h window, half the token price).
+    
+    Meant for bulk/background recrawls, not interactive requests. Each line is one
+    of the shard requests optimize_with_llm would send, with custom_id
+    "<shard index>|<site URL>". Returns the batch id for poll_batch.
+    """
+    client = _get_client()
+    if client is None:
+        raise RuntimeError("OpenAI not available for batch submission")
+    
+    requests_by_site: Dict[str, List[bytes]] = {}
+    for audit_data, _scores in audits:
+        site_url = audit_data.get("url", "")
+        pages, _counts = _content_pages(audit_data)
+        if not site_url or not pages or site_url in requests_by_site:
+            continue
+        languages = audit_data.get("languages", [])
+        if not isinstance(languages, list):
+            languages = []
+        languages_str = ', '.join(str(l) for l in languages) if languages else 'Unknown'
+        requests_by_site[site_url] = [
+            _json_dumps_sorted({
+                "custom_id": f"{i}|{site_url}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": dict(
+                    _chat_body(_audit_prompt(site_url, len(pages), languages_str, shard), _max_tokens_for(len(shard))),
+                    prompt_cache_key=LLM_PROMPT_CACHE_KEY
+                )
+            })
+            for i, shard in enumerate(_shard_pages(pages))
+        ]
+    
+    if not requests_by_site:
+        raise ValueError("No audits with content pages to batch")
+    
+    jsonl = b"\n".join(line for lines in requests_by_site.values() for line in lines)
+    batch_file = await client.files.create(file=("llm_batch.jsonl", jsonl), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    log.debug("Submitted LLM batch %s for %d sites", batch.id, len(requests_by_site))
+    return batch.id
+
+
+async def poll_batch(batch_id: str, interval: float = 60) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Wait for a batch from submit_llm_batch to finish and return its results by site URL.
+    
+    A site maps to None when none of its requests produced valid JSON, including
+    sites whose requests all ended up in the batch's error file; pages from the
+    shards that did are kept in shard order. A batch that never ran (e.g. failed
+    validation) returns {}.
+    """
+    client = _get_client()
+    if client is None:
+        raise RuntimeError("OpenAI not available for batch polling")
+    
+    batch = await client.batches.retrieve(batch_id)
+    while batch.status in ("validating", "in_progress", "finalizing"):
+        await asyncio.sleep(interval)
+        batch = await client.batches.retrieve(batch_id)
+    
+    log.debug("LLM batch %s finished with status %s", batch_id, batch.status)
+    shards_by_site: Dict[str, Dict[int, List[Dict[str, Any]]]] = {}
+    
+    # Failed, expired and cancelled requests only show up in the error file
+    if batch.error_file_id:
+        errors = await client.files.content(batch.error_file_id)
+        for line in errors.text.splitlines():
+            if line.strip():
+                shards_by_site.setdefault(str(_json_loads(line).get("custom_id", "")).partition("|")[2], {})
+    if not batch.output_file_id:
+        return {site_url: None for site_url in shards_by_site}
+    
+    output = await client.files.content(batch.output_file_id)
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        record = _json_loads(line)
+        index, _, site_url = str(record.get("custom_id", "")).partition("|")
+        site_shards = shards_by_site.setdefault(site_url, {})
+        response = record.get("response") or {}
+        try:
+            llm_content = response["body"]["choices"][0]["message"]["content"].strip()
+            parsed = _share_strings(_extract_json(llm_content))
+            site_shards[int(index)] = [p for p in parsed.get("pages_optimized") or [] if isinstance(p, dict)]
+        except (KeyError, IndexError, TypeError, ValueError, AttributeError) as e:
+            log.warning("LLM batch result for %s (shard %s) unusable: %s", site_url, index, e)
+    
+    return {
+        site_url: {"pages_optimized": [p for i in sorted(site_shards) for p in site_shards[i]]} if site_shards else None
+        for site_url, site_shards in shards_by_site.items()
+    }
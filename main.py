@@ -4,6 +4,7 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
 import json
+import logging
 import os
 from supabase import create_client, Client
 from fastapi.middleware.cors import CORSMiddleware   # 👈 ADD THIS LINE
@@ -16,7 +17,8 @@ from aeo_geo_scoring import score_website
 from aeo_geo_optimizer import detect_faq, extract_images, optimize_meta_description, run_llm_queries, check_geo_signals, generate_blog_post
 from aeo_geo_audit import audit_site_aeo_geo, audit_single_page_aeo_geo
 from audit import audit_site
-from enhanced_audit import enhanced_audit_site
+from enhanced_audit import enhanced_audit_site, close_browser
+from llm_optimizer import close_llm_client
 from query_analyzer import analyze_query_visibility
 from scrapingbee_crawler import crawl_website_with_scrapingbee
 from signal_extractor import extract_signals_from_pages
@@ -28,6 +30,10 @@ from datetime import datetime
 import stripe
 
 
+# Module loggers (e.g. llm_optimizer) stay quiet unless LOG_LEVEL=DEBUG; unknown names mean WARNING
+_log_level = getattr(logging, os.getenv("LOG_LEVEL", "WARNING").upper(), None)
+logging.basicConfig(level=_log_level if isinstance(_log_level, int) else logging.WARNING)
+
 app = FastAPI()
 
 # ✅ Enable CORS so your frontend (tryevika.com) can call this API
@@ -46,6 +52,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("shutdown")
+async def _close_audit_browser():
+    """Close the Chromium instance shared by JS-rendered audits"""
+    await close_browser()
+
+@app.on_event("shutdown")
+async def _close_llm_client():
+    """Close the OpenAI client shared by LLM optimizations"""
+    await close_llm_client()
+
 # Configure Stripe
 stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
 
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Test llm_optimizer's JSON parsing and shard/caching logic with a fake OpenAI client
+No API key or network access needed
+"""
+
+import sys
+import json
+import asyncio
+from types import SimpleNamespace
+sys.path.append('.')
+
+import llm_optimizer
+
+SCORES = {"scores": {"seo": 70, "aeo": 50}}
+
+
+class FakeCompletions:
+    """Answers each shard with one entry per page URL in its prompt; fail_urls get a non-JSON reply"""
+
+    def __init__(self, fail_urls=()):
+        self.fail_urls = set(fail_urls)
+        self.calls = 0
+
+    async def create(self, **request):
+        self.calls += 1
+        prompt = request["messages"][-1]["content"]
+        urls = [json.loads(line)["url"] for line in prompt.splitlines() if line.startswith("{")]
+        if self.fail_urls.intersection(urls):
+            content = "Sorry, I can't help with that."
+        else:
+            content = json.dumps({"pages_optimized": [
+                {"url": url, "from_llm": True, "basic_seo": {"new_title": f"LLM title for {url}"}} for url in urls
+            ]})
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _audit(site_url, paths):
+    return {
+        "url": site_url,
+        "languages": ["en"],
+        "pages": [{"url": f"{site_url}/{path}", "title": f"Page {path}", "h1": [path]} for path in paths],
+    }
+
+
+def _run_with_client(completions, coro_factory):
+    previous = llm_optimizer._client
+    llm_optimizer._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    try:
+        return asyncio.run(coro_factory())
+    finally:
+        llm_optimizer._client = previous
+
+
+def test_matching_brace_skips_string_literals():
+    """Braces and escaped quotes inside strings do not end the object"""
+    print("🧪 Testing brace matching inside string literals...")
+
+    text = 'prefix {"a": "}{ \\"quoted\\" }", "b": {"c": "\\\\"}} suffix'
+    start = text.index("{")
+    end = llm_optimizer._matching_brace(text, start)
+    assert text[end + 1:] == " suffix", text[end + 1:]
+    assert json.loads(text[start:end + 1]) == {"a": '}{ "quoted" }', "b": {"c": "\\"}}
+
+    fenced = 'Here you go:\n```json\n{"pages_optimized": [{"url": "/a", "faq": "what is {x}?"}]}\n```'
+    parsed = llm_optimizer._extract_json(fenced)
+    assert parsed == {"pages_optimized": [{"url": "/a", "faq": "what is {x}?"}]}, parsed
+
+    print("✅ Brace matching works")
+    return True
+
+
+def test_stream_parser_one_char_at_a_time():
+    """Pages are emitted as soon as each object closes, even with one-character deltas"""
+    print("🧪 Testing streamed pages_optimized parsing...")
+
+    pages = [
+        {"url": "/a", "new_title": 'Say "hi" }'},
+        {"url": "/b", "faq": [{"q": "a}{", "a": '\\"}'}]},
+        {"url": "/c"},
+    ]
+    reply = json.dumps({"brand_guess": "{brand}", "pages_optimized": pages, "notes": "done"}, indent=2)
+
+    parser = llm_optimizer._PageStreamParser()
+    emitted = []
+    for char in reply:
+        emitted.extend(parser.feed(char))
+
+    assert emitted == pages, emitted
+    assert parser.text == reply
+
+    print(f"✅ Stream parser emitted {len(emitted)} pages")
+    return True
+
+
+def test_truncated_reply_raises():
+    """A reply cut off mid-object raises json.JSONDecodeError"""
+    print("🧪 Testing truncated LLM reply...")
+
+    try:
+        llm_optimizer._extract_json('{"pages_optimized": [{"url": "/a", "new_title": "Unfinis')
+    except json.JSONDecodeError:
+        print("✅ Truncated reply raises JSONDecodeError")
+        return True
+    raise AssertionError("truncated reply was parsed")
+
+
+def test_failed_shard_keeps_base_pages():
+    """Pages of a failed shard fall back to their base optimizations instead of vanishing"""
+    print("🧪 Testing partial shard failure...")
+
+    site_url = "https://shards.example.com"
+    audit = _audit(site_url, [f"p{i}" for i in range(10)])
+    # Default shards are 4 pages each, so p4..p7 share the failing request
+    completions = FakeCompletions(fail_urls={f"{site_url}/p4"})
+    result = _run_with_client(
+        completions, lambda: llm_optimizer.optimize_with_llm(audit, SCORES, force_refresh=True)
+    )
+
+    by_url = {page["url"]: page for page in result["pages_optimized"]}
+    assert set(by_url) == {page["url"] for page in audit["pages"]}, sorted(by_url)
+    for i in range(10):
+        page = by_url[f"{site_url}/p{i}"]
+        assert bool(page.get("from_llm")) == (i not in range(4, 8)), page
+
+    print(f"✅ All {len(by_url)} pages returned with one failed shard")
+    return True
+
+
+def test_merged_pages_use_the_llm_schema():
+    """Base optimizations are mapped into the LLM page shape; no page carries both suggestion formats"""
+    print("🧪 Testing merged page shape...")
+
+    site_url = "https://shape.example.com"
+    audit = _audit(site_url, [f"s{i}" for i in range(6)])
+    # Shards of 4: s4 and s5 only get base optimizations
+    completions = FakeCompletions(fail_urls={f"{site_url}/s4"})
+    result = _run_with_client(
+        completions, lambda: llm_optimizer.optimize_with_llm(audit, SCORES, force_refresh=True)
+    )
+
+    pages = result["pages_optimized"]
+    assert len(pages) == 6, len(pages)
+    for page in pages:
+        assert "suggestions" not in page, page
+        assert "current_title" in page, page
+        assert set(page["basic_seo"]) >= {"new_title", "new_meta", "new_h1"}, page
+        from_llm = page["url"] not in (f"{site_url}/s4", f"{site_url}/s5")
+        # The LLM's own recommendation wins; base only fills the gaps
+        assert page["basic_seo"]["new_title"].startswith("LLM title") == from_llm, page
+        assert page.get("fallback", False) == (not from_llm), page
+
+    print(f"✅ All {len(pages)} merged pages share the LLM schema")
+    return True
+
+
+def test_semantic_cache_is_scoped_to_page_urls():
+    """A similar audit of the same site with different pages is not answered from the semantic cache"""
+    print("🧪 Testing semantic cache scope...")
+
+    site_url = "https://semantic.example.com"
+    first = _audit(site_url, [f"q{i}" for i in range(10)])
+    second = _audit(site_url, [f"new{i}" for i in range(11)])
+    completions = FakeCompletions()
+
+    async def run_both():
+        await llm_optimizer.optimize_with_llm(first, SCORES)
+        calls = completions.calls
+        result = await llm_optimizer.optimize_with_llm(second, SCORES)
+        return calls, result
+
+    calls, result = _run_with_client(completions, run_both)
+
+    assert completions.calls > calls, "second audit was served from the semantic cache"
+    urls = {page["url"] for page in result["pages_optimized"]}
+    assert urls == {page["url"] for page in second["pages"]}, sorted(urls)
+
+    print("✅ Semantic cache did not reuse another page set")
+    return True
+
+
+def test_semantic_cache_misses_after_a_fix():
+    """A re-audit that fixes one page's title is not answered with the pre-fix result"""
+    print("🧪 Testing semantic cache after page fixes...")
+
+    site_url = "https://fixes.example.com"
+    before = _audit(site_url, [f"f{i}" for i in range(30)])
+    for page in before["pages"][:10]:
+        page["title"] = ""
+    rescored = {"scores": {"seo": 71, "aeo": 50}}
+    after = _audit(site_url, [f"f{i}" for i in range(30)])
+    for page in after["pages"][1:10]:
+        page["title"] = ""
+    completions = FakeCompletions()
+
+    async def run_all():
+        await llm_optimizer.optimize_with_llm(before, SCORES)
+        first = completions.calls
+        # Same pages, score moved by a point: served from the semantic cache
+        await llm_optimizer.optimize_with_llm(before, rescored)
+        second = completions.calls
+        await llm_optimizer.optimize_with_llm(after, SCORES)
+        return first, second, completions.calls
+
+    first, second, third = _run_with_client(completions, run_all)
+
+    assert second == first, "unchanged re-audit missed the semantic cache"
+    assert third > second, "re-audit with a fixed title was served from the semantic cache"
+
+    print("✅ Semantic cache misses once a page is fixed")
+    return True
+
+
+def main():
+    """Run all llm_optimizer tests"""
+    print("🚀 Testing llm_optimizer")
+    print("=" * 60)
+
+    tests = [
+        test_matching_brace_skips_string_literals,
+        test_stream_parser_one_char_at_a_time,
+        test_truncated_reply_raises,
+        test_failed_shard_keeps_base_pages,
+        test_merged_pages_use_the_llm_schema,
+        test_semantic_cache_is_scoped_to_page_urls,
+        test_semantic_cache_misses_after_a_fix,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            passed += bool(test())
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e!r}")
+
+    print("=" * 60)
+    print(f"🎯 Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)